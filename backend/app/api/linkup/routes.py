@@ -4,62 +4,99 @@ Real-time web content integration for enhanced gameplay
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Optional, List, Dict, Any, Tuple
+import asyncio
+import functools
 import logging
+import time
+import msgspec
+import orjson
 
 from app.services.linkup_service import linkup_service
+from app.utils.json_body import json_body, json_body_openapi
 
 logger = logging.getLogger(__name__)
-router = APIRouter(tags=["linkup"])
+router = APIRouter(tags=["linkup"], default_response_class=ORJSONResponse)
 
 # Request Models
-class RulesLookupRequest(BaseModel):
+class RequestModel(msgspec.Struct, frozen=True):
+    """Base for request bodies - decoded by msgspec, immutable, unknown keys dropped"""
+
+class RulesLookupRequest(RequestModel):
     query: str
     context: Optional[str] = ""
 
-class MonsterSearchRequest(BaseModel):
+class MonsterSearchRequest(RequestModel):
     challenge_rating: Optional[str] = ""
     environment: Optional[str] = ""
 
-class SpellSearchRequest(BaseModel):
+class SpellSearchRequest(RequestModel):
     spell_name: Optional[str] = ""
     spell_level: Optional[str] = ""
     character_class: Optional[str] = ""
 
-class ItemSearchRequest(BaseModel):
+class ItemSearchRequest(RequestModel):
     item_type: Optional[str] = ""
     rarity: Optional[str] = ""
 
-class CampaignInspirationRequest(BaseModel):
+class CampaignInspirationRequest(RequestModel):
     theme: Optional[str] = ""
     setting: Optional[str] = ""
 
-class SceneEnhancementRequest(BaseModel):
+class SceneEnhancementRequest(RequestModel):
     scene_description: str
     party_level: Optional[int] = 1
 
-class CharacterBuildRequest(BaseModel):
+class CharacterBuildRequest(RequestModel):
     character_class: str
     level: Optional[int] = 1
     build_type: Optional[str] = ""
 
+# Health probes reuse the last test query result for this long
+STATUS_PROBE_TTL = 30.0
+STATUS_PROBE_TIMEOUT = 2.0
+
+# (monotonic time of last probe, whether it succeeded)
+_last_probe: Tuple[float, bool] = (0.0, False)
+
+async def _probe_linkup() -> Tuple[bool, bool]:
+    """Run the status test query at most once per STATUS_PROBE_TTL; returns (success, cached)"""
+    global _last_probe
+    probed_at, ok = _last_probe
+    now = time.monotonic()
+    if probed_at and now - probed_at < STATUS_PROBE_TTL:
+        return ok, True
+    
+    try:
+        # Bypass the lookup cache so a probe always reflects Linkup's current state
+        test_result = await asyncio.wait_for(
+            linkup_service.search_dnd_rules_uncached("initiative order", "combat"),
+            timeout=STATUS_PROBE_TIMEOUT
+        )
+        ok = bool(test_result.get("success", False))
+    except asyncio.TimeoutError:
+        logger.warning("Linkup status probe timed out")
+        ok = False
+    
+    _last_probe = (now, ok)
+    return ok, False
+
 @router.get("/status")
 async def get_linkup_status():
     """
     🔗 Check Linkup.so service status
     """
     try:
-        # Test with a simple query
-        test_result = await linkup_service.search_dnd_rules("initiative order", "combat")
+        test_query_success, probe_cached = await _probe_linkup()
         
-        return JSONResponse({
+        return {
             "success": True,
             "service": "Linkup.so D&D Enhancement",
             "status": "ONLINE",
             "api_key_configured": bool(linkup_service.api_key),
-            "test_query_success": test_result.get("success", False),
+            "test_query_success": test_query_success,
+            "probe_cached": probe_cached,
             "features": [
                 "🎲 D&D Rules Lookup",
                 "🐲 Monster Database Search", 
@@ -70,252 +107,187 @@ async def get_linkup_status():
                 "🌟 Scene Enhancement",
                 "👤 Character Build Advice"
             ]
-        })
+        }
     except Exception as e:
         logger.error(f"Linkup status check failed: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "success": False,
             "error": str(e),
             "status": "ERROR"
         }, status_code=500)
 
-@router.post("/rules-lookup")
-async def lookup_dnd_rules(request: RulesLookupRequest):
+# Long string values are encoded and written in slices of this many characters
+STREAM_CHUNK_CHARS = 8192
+
+def _stream_json(payload: Dict[str, Any]):
+    """Yield a flat JSON object incrementally, slicing long strings and lists"""
+    yield b"{"
+    for index, (key, value) in enumerate(payload.items()):
+        yield (b"," if index else b"") + orjson.dumps(key) + b":"
+        if isinstance(value, str) and len(value) > STREAM_CHUNK_CHARS:
+            yield b'"'
+            for start in range(0, len(value), STREAM_CHUNK_CHARS):
+                # Escaping is per character, so encoded slices concatenate into one valid string
+                yield orjson.dumps(value[start:start + STREAM_CHUNK_CHARS])[1:-1]
+            yield b'"'
+        elif isinstance(value, list):
+            yield b"["
+            for item_index, item in enumerate(value):
+                yield (b"," if item_index else b"") + orjson.dumps(item)
+            yield b"]"
+        else:
+            yield orjson.dumps(value)
+    yield b"}"
+
+def linkup_endpoint(label: str, type_name: str, answer_key: str, answer_source: str = "answer", stream: bool = False):
     """
-    🎲 Look up D&D rules and mechanics
+    Wrap a route that returns (service_result, echo_fields) with the shared
+    success check, logging and response envelope.
+    With stream=True the body is written incrementally instead of encoded at once.
     """
-    try:
-        result = await linkup_service.search_dnd_rules(request.query, request.context)
-        
-        if result["success"]:
-            logger.info(f"✅ Rules lookup successful: {request.query}")
-            return JSONResponse({
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            try:
+                result, echo = await handler(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{label} error: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+            
+            if not result["success"]:
+                logger.error(f"❌ {label} failed: {result.get('error')}")
+                raise HTTPException(status_code=500, detail=f"{label} failed: {result.get('error')}")
+            
+            logger.info(f"✅ {label} successful: {echo}")
+            payload = {
                 "success": True,
-                "query": request.query,
-                "answer": result["answer"],
+                **echo,
+                answer_key: result[answer_source],
                 "sources": result["sources"],
-                "type": "rules_lookup",
+                "type": type_name,
                 "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Rules lookup failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Rules lookup failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Rules lookup error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            }
+            if stream:
+                return StreamingResponse(_stream_json(payload), media_type="application/json")
+            return payload
+        return wrapper
+    return decorator
 
-@router.post("/monster-search")
-async def search_monsters(request: MonsterSearchRequest):
+@router.post("/rules-lookup", openapi_extra=json_body_openapi(RulesLookupRequest))
+@linkup_endpoint("Rules lookup", "rules_lookup", "answer", stream=True)
+async def lookup_dnd_rules(request: RulesLookupRequest = json_body(RulesLookupRequest)):
+    """
+    🎲 Look up D&D rules and mechanics
+    """
+    result = await linkup_service.search_dnd_rules(request.query, request.context)
+    return result, {"query": request.query}
+
+@router.post("/monster-search", openapi_extra=json_body_openapi(MonsterSearchRequest))
+@linkup_endpoint("Monster search", "monster_search", "monsters")
+async def search_monsters(request: MonsterSearchRequest = json_body(MonsterSearchRequest)):
     """
     🐲 Search for D&D monsters by challenge rating and environment
     """
-    try:
-        result = await linkup_service.search_monsters(
-            request.challenge_rating, 
-            request.environment
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Monster search successful: CR {request.challenge_rating}, {request.environment}")
-            return JSONResponse({
-                "success": True,
-                "monsters": result["answer"],
-                "sources": result["sources"],
-                "challenge_rating": request.challenge_rating,
-                "environment": request.environment,
-                "type": "monster_search",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Monster search failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Monster search failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Monster search error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.search_monsters(
+        request.challenge_rating, 
+        request.environment
+    )
+    return result, {
+        "challenge_rating": request.challenge_rating,
+        "environment": request.environment
+    }
 
-@router.post("/spell-lookup")
-async def lookup_spells(request: SpellSearchRequest):
+@router.post("/spell-lookup", openapi_extra=json_body_openapi(SpellSearchRequest))
+@linkup_endpoint("Spell lookup", "spell_lookup", "spell_info")
+async def lookup_spells(request: SpellSearchRequest = json_body(SpellSearchRequest)):
     """
     ✨ Look up D&D spells and magical abilities
     """
-    try:
-        result = await linkup_service.search_spells(
-            request.spell_name,
-            request.spell_level,
-            request.character_class
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Spell lookup successful: {request.spell_name}")
-            return JSONResponse({
-                "success": True,
-                "spell_info": result["answer"],
-                "sources": result["sources"],
-                "spell_name": request.spell_name,
-                "spell_level": request.spell_level,
-                "character_class": request.character_class,
-                "type": "spell_lookup",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Spell lookup failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Spell lookup failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Spell lookup error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.search_spells(
+        request.spell_name,
+        request.spell_level,
+        request.character_class
+    )
+    return result, {
+        "spell_name": request.spell_name,
+        "spell_level": request.spell_level,
+        "character_class": request.character_class
+    }
 
-@router.post("/item-search")
-async def search_items(request: ItemSearchRequest):
+@router.post("/item-search", openapi_extra=json_body_openapi(ItemSearchRequest))
+@linkup_endpoint("Item search", "item_search", "items")
+async def search_items(request: ItemSearchRequest = json_body(ItemSearchRequest)):
     """
     ⚔️ Search for magical items and equipment
     """
-    try:
-        result = await linkup_service.search_items_and_equipment(
-            request.item_type,
-            request.rarity
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Item search successful: {request.item_type}, {request.rarity}")
-            return JSONResponse({
-                "success": True,
-                "items": result["answer"],
-                "sources": result["sources"],
-                "item_type": request.item_type,
-                "rarity": request.rarity,
-                "type": "item_search",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Item search failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Item search failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Item search error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.search_items_and_equipment(
+        request.item_type,
+        request.rarity
+    )
+    return result, {
+        "item_type": request.item_type,
+        "rarity": request.rarity
+    }
 
-@router.post("/campaign-inspiration")
-async def get_campaign_inspiration(request: CampaignInspirationRequest):
+@router.post("/campaign-inspiration", openapi_extra=json_body_openapi(CampaignInspirationRequest))
+@linkup_endpoint("Campaign inspiration", "campaign_inspiration", "inspiration", stream=True)
+async def get_campaign_inspiration(request: CampaignInspirationRequest = json_body(CampaignInspirationRequest)):
     """
     🗺️ Get campaign ideas and plot hooks
     """
-    try:
-        result = await linkup_service.search_campaign_inspiration(
-            request.theme,
-            request.setting
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Campaign inspiration successful: {request.theme}, {request.setting}")
-            return JSONResponse({
-                "success": True,
-                "inspiration": result["answer"],
-                "sources": result["sources"],
-                "theme": request.theme,
-                "setting": request.setting,
-                "type": "campaign_inspiration",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Campaign inspiration failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Campaign inspiration failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Campaign inspiration error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.search_campaign_inspiration(
+        request.theme,
+        request.setting
+    )
+    return result, {
+        "theme": request.theme,
+        "setting": request.setting
+    }
 
 @router.get("/dnd-news")
+@linkup_endpoint("D&D news", "dnd_news", "news")
 async def get_dnd_news():
     """
     📰 Get latest D&D news and updates
     """
-    try:
-        result = await linkup_service.search_dnd_news()
-        
-        if result["success"]:
-            logger.info("✅ D&D news fetch successful")
-            return JSONResponse({
-                "success": True,
-                "news": result["answer"],
-                "sources": result["sources"],
-                "type": "dnd_news",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ D&D news failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"D&D news failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"D&D news error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.search_dnd_news()
+    return result, {}
 
-@router.post("/enhance-scene")
-async def enhance_scene_with_content(request: SceneEnhancementRequest):
+@router.post("/enhance-scene", openapi_extra=json_body_openapi(SceneEnhancementRequest))
+@linkup_endpoint("Scene enhancement", "scene_enhancement", "enhanced_content", answer_source="enhanced_content", stream=True)
+async def enhance_scene_with_content(request: SceneEnhancementRequest = json_body(SceneEnhancementRequest)):
     """
     🌟 Enhance current scene with relevant D&D content
     """
-    try:
-        result = await linkup_service.enhance_scene_with_content(
-            request.scene_description,
-            request.party_level
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Scene enhancement successful for level {request.party_level}")
-            return JSONResponse({
-                "success": True,
-                "original_scene": request.scene_description,
-                "enhanced_content": result["enhanced_content"],
-                "sources": result["sources"],
-                "party_level": request.party_level,
-                "type": "scene_enhancement",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Scene enhancement failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Scene enhancement failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Scene enhancement error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.enhance_scene_with_content(
+        request.scene_description,
+        request.party_level
+    )
+    return result, {
+        "original_scene": request.scene_description,
+        "party_level": request.party_level
+    }
 
-@router.post("/character-build-advice")
-async def get_character_build_advice(request: CharacterBuildRequest):
+@router.post("/character-build-advice", openapi_extra=json_body_openapi(CharacterBuildRequest))
+@linkup_endpoint("Character build advice", "character_build", "advice", answer_source="build_advice")
+async def get_character_build_advice(request: CharacterBuildRequest = json_body(CharacterBuildRequest)):
     """
     👤 Get character optimization and build advice
     """
-    try:
-        result = await linkup_service.get_character_build_advice(
-            request.character_class,
-            request.level,
-            request.build_type
-        )
-        
-        if result["success"]:
-            logger.info(f"✅ Character build advice successful: {request.character_class} level {request.level}")
-            return JSONResponse({
-                "success": True,
-                "character_class": request.character_class,
-                "level": request.level,
-                "build_type": request.build_type,
-                "advice": result["build_advice"],
-                "sources": result["sources"],
-                "type": "character_build",
-                "linkup_powered": True
-            })
-        else:
-            logger.error(f"❌ Character build advice failed: {result.get('error')}")
-            raise HTTPException(status_code=500, detail=f"Character build advice failed: {result.get('error')}")
-            
-    except Exception as e:
-        logger.error(f"Character build advice error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await linkup_service.get_character_build_advice(
+        request.character_class,
+        request.level,
+        request.build_type
+    )
+    return result, {
+        "character_class": request.character_class,
+        "level": request.level,
+        "build_type": request.build_type
+    }
 
-# Quick lookup endpoints with query parameters
+# Quick lookup endpoints with query parameters - call the service directly, no request model
 @router.get("/quick-rules")
+@linkup_endpoint("Rules lookup", "rules_lookup", "answer", stream=True)
 async def quick_rules_lookup(
     q: str = Query(..., description="Rules query"),
     context: str = Query("", description="Additional context")
@@ -323,10 +295,11 @@ async def quick_rules_lookup(
     """
     🎲 Quick D&D rules lookup via GET request
     """
-    request = RulesLookupRequest(query=q, context=context)
-    return await lookup_dnd_rules(request)
+    result = await linkup_service.search_dnd_rules(q, context)
+    return result, {"query": q}
 
 @router.get("/quick-spell")
+@linkup_endpoint("Spell lookup", "spell_lookup", "spell_info")
 async def quick_spell_lookup(
     name: str = Query("", description="Spell name"),
     level: str = Query("", description="Spell level"),
@@ -335,14 +308,15 @@ async def quick_spell_lookup(
     """
     ✨ Quick spell lookup via GET request
     """
-    request = SpellSearchRequest(
-        spell_name=name,
-        spell_level=level,
-        character_class=class_name
-    )
-    return await lookup_spells(request)
+    result = await linkup_service.search_spells(name, level, class_name)
+    return result, {
+        "spell_name": name,
+        "spell_level": level,
+        "character_class": class_name
+    }
 
 @router.get("/quick-monster")
+@linkup_endpoint("Monster search", "monster_search", "monsters")
 async def quick_monster_search(
     cr: str = Query("", description="Challenge Rating"),
     environment: str = Query("", description="Environment type")
@@ -350,8 +324,8 @@ async def quick_monster_search(
     """
     🐲 Quick monster search via GET request
     """
-    request = MonsterSearchRequest(
-        challenge_rating=cr,
-        environment=environment
-    )
-    return await search_monsters(request) 
\ No newline at end of file
+    result = await linkup_service.search_monsters(cr, environment)
+    return result, {
+        "challenge_rating": cr,
+        "environment": environment
+    }
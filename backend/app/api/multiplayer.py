@@ -3,10 +3,14 @@ Multiplayer D&D API Endpoints
 Voice-enabled multiplayer sessions with AI companions
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
-from typing import Dict, List, Any, Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from typing import Callable, Deque, Dict, Any, Optional, Tuple
+from collections import deque
 import asyncio
+import logging
+import msgspec
+import orjson
 
 from ..models.multiplayer_session import (
     create_multiplayer_session,
@@ -15,23 +19,46 @@ from ..models.multiplayer_session import (
     multiplayer_manager
 )
 from ..models.ai_players import get_ai_players, generate_ai_player_response
-from ..services.minimax_direct_api import create_voice_direct
+from ..services.tts_batcher import tts_batcher
+from ..utils.json_body import json_body, json_body_openapi
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Sample line per character voice for /voice-test
+VOICE_TEST_PHRASES = {
+    "dm_narrator": "Welcome brave adventurers! Your epic quest awaits in the depths of the ancient dungeon!",
+    "dwarf_warrior": "By me beard! I'll smash any foe that stands in our way! Let's show 'em what we're made of!",
+    "elf_mage": "The arcane energies flow through this place... I sense ancient magic and hidden secrets await us.",
+    "human_rogue": "Well, this looks suspiciously like a trap. Good thing I brought my lucky lockpicks and charm!",
+    "wise_elder": "Patience, young ones. Wisdom teaches us that careful observation often reveals the safest path forward.",
+    "dragon": "Foolish mortals... You dare enter my domain? Your treasures will make fine additions to my hoard!",
+    "fairy_companion": "Oh my! This place is simply magical! I can feel the enchantments dancing in the air around us!",
+    "orc_villain": "GRAAHHH! You will pay for your interference! Prepare to face the wrath of the Iron Clan!"
+}
+DEFAULT_VOICE_TEST_PHRASE = "Hello adventurers! This is a voice test."
+
+# Shared read-only fallback for missing response dicts
+_EMPTY: Dict[str, Any] = {}
 
 # Request Models
-class CreateSessionRequest(BaseModel):
+class RequestModel(msgspec.Struct, frozen=True):
+    """Base for request bodies - decoded by msgspec, immutable, unknown keys dropped"""
+
+class CreateSessionRequest(RequestModel):
     player_name: str
     voice_mode: bool = True
 
-class PlayerActionRequest(BaseModel):
+class PlayerActionRequest(RequestModel):
     session_id: str
     player_name: str
     action: str
     dialogue: str = ""
     generate_voice: bool = True
+    # Return immediately and fetch clips from /session/{id}/audio instead of waiting on TTS
+    voice_async: bool = False
 
-class VoiceGenerationRequest(BaseModel):
+class VoiceGenerationRequest(RequestModel):
     session_id: str
     player_name: str
     text: str
@@ -39,8 +66,8 @@ class VoiceGenerationRequest(BaseModel):
 
 # === MULTIPLAYER SESSION ENDPOINTS ===
 
-@router.post("/create-session")
-async def create_session(request: CreateSessionRequest) -> Dict[str, Any]:
+@router.post("/create-session", response_model=None, openapi_extra=json_body_openapi(CreateSessionRequest))
+async def create_session(request: CreateSessionRequest = json_body(CreateSessionRequest)) -> Dict[str, Any]:
     """🎮 Create new multiplayer D&D session with AI companions"""
     
     try:
@@ -53,9 +80,9 @@ async def create_session(request: CreateSessionRequest) -> Dict[str, Any]:
         # Generate voice for opening scene if voice mode enabled
         if request.voice_mode:
             opening_scene = session_data["opening_scene"]
-            voice_result = await create_voice_direct(
-                text=opening_scene["description"] + " " + opening_scene["dm_welcome"],
-                character_type="dm_narrator"
+            voice_result = await tts_batcher.submit(
+                opening_scene["description"] + " " + opening_scene["dm_welcome"],
+                "dm_narrator"
             )
             
             if voice_result.get("success"):
@@ -74,7 +101,7 @@ async def create_session(request: CreateSessionRequest) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
-@router.get("/session/{session_id}")
+@router.get("/session/{session_id}", response_model=None)
 async def get_session(session_id: str) -> Dict[str, Any]:
     """📊 Get current session information"""
     
@@ -88,95 +115,92 @@ async def get_session(session_id: str) -> Dict[str, Any]:
         "multiplayer_active": True
     }
 
-@router.post("/player-action")
-async def player_action(
-    request: PlayerActionRequest,
-    background_tasks: BackgroundTasks
-) -> Dict[str, Any]:
+@router.post("/player-action", response_model=None, openapi_extra=json_body_openapi(PlayerActionRequest))
+async def player_action(request: PlayerActionRequest = json_body(PlayerActionRequest)) -> Response:
     """⚔️ Process player action and generate AI companion responses"""
     
     try:
-        print(f"🔍 Processing action: {request.session_id}, {request.player_name}, {request.action}")
+        session_id = request.session_id
+        logger.debug("🔍 Processing action: %s, %s, %s", session_id, request.player_name, request.action)
         
-        # Validate session exists first
-        session_info = get_session_info(request.session_id)
-        if not session_info:
-            print(f"❌ Session not found: {request.session_id}")
-            raise HTTPException(status_code=404, detail=f"Session {request.session_id} not found")
-        
-        print(f"✅ Session found: {session_info['session_id']}")
+        # Validate session exists first (plain lookup, no info dict built)
+        if multiplayer_manager.get_session(session_id) is None:
+            logger.debug("❌ Session not found: %s", session_id)
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
         
         # Process player turn and get AI responses
         turn_result = process_player_turn(
-            session_id=request.session_id,
+            session_id=session_id,
             player_name=request.player_name,
             action=request.action,
             dialogue=request.dialogue
         )
         
-        print(f"🎲 Turn result keys: {turn_result.keys() if isinstance(turn_result, dict) else 'Not a dict'}")
-        
-        if "error" in turn_result:
-            print(f"❌ Turn processing error: {turn_result['error']}")
-            raise HTTPException(status_code=404, detail=turn_result["error"])
+        if turn_result is None:
+            logger.debug("❌ Session ended mid-turn: %s", session_id)
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
         
         # Generate voice for AI responses if voice mode enabled
+        audio_pending = False
         if request.generate_voice:
-            print(f"🎤 Generating voice for responses...")
+            # Collect (target, speaker, text, voice_id) jobs so all TTS calls run concurrently
+            jobs = []
             
-            # Generate voice for DM response
-            dm_response = turn_result.get("dm_response", {})
-            if dm_response.get("dm_narration"):
-                print(f"🎭 Generating DM voice...")
-                voice_result = await create_voice_direct(
-                    text=dm_response["dm_narration"],
-                    character_type="dm_narrator"
-                )
-                if voice_result.get("success"):
-                    turn_result["dm_response"]["audio_file"] = voice_result.get("audio_url")
-                    print(f"✅ DM voice generated: {voice_result.get('audio_url')}")
+            dm_response = turn_result.dm_response or _EMPTY
+            dm_text = dm_response.get("dm_narration")
+            if dm_text:
+                jobs.append((dm_response, "DM", dm_text, "dm_narrator"))
+            
+            for ai_response in turn_result.ai_responses:
+                get = ai_response.get
+                text = get("response")
+                if text:
+                    jobs.append((ai_response, get("player_name", "Unknown"), text, get("voice_id") or "dm_narrator"))
             
-            # Generate voices for AI player responses
-            ai_responses = turn_result.get("ai_responses", [])
-            for i, ai_response in enumerate(ai_responses):
-                if ai_response.get("response"):
-                    print(f"🤖 Generating voice for {ai_response.get('player_name', 'Unknown')}")
-                    voice_result = await create_voice_direct(
-                        text=ai_response["response"],
-                        character_type=ai_response.get("voice_id", "dm_narrator")
-                    )
+            turn_number = turn_result.turn_number
+            if request.voice_async and len(_voice_tasks) + len(jobs) <= MAX_PENDING_VOICE_TASKS:
+                for _, speaker, text, voice_id in jobs:
+                    _spawn_voice_task(generate_voice_for_response(text, voice_id, session_id, speaker, turn_number))
+                _pending_audio[session_id] = _pending_audio.get(session_id, 0) + len(jobs)
+                audio_pending = bool(jobs)
+            else:
+                submit = tts_batcher.submit
+                results = await asyncio.gather(
+                    *(submit(text, voice_id) for _, _, text, voice_id in jobs),
+                    return_exceptions=True
+                )
+                
+                for (target, speaker, _, _), voice_result in zip(jobs, results):
+                    if isinstance(voice_result, Exception):
+                        logger.warning("❌ Voice generation failed for %s: %s", speaker, voice_result)
+                        continue
                     if voice_result.get("success"):
-                        turn_result["ai_responses"][i]["audio_file"] = voice_result.get("audio_url")
-                        print(f"✅ Voice generated for {ai_response.get('player_name')}: {voice_result.get('audio_url')}")
-        
-        print(f"✅ Action processed successfully!")
+                        audio_url = voice_result.get("audio_url")
+                        target["audio_file"] = audio_url
+                        logger.debug("✅ Voice generated for %s: %s", speaker, audio_url)
         
-        return {
+        # TurnResult is a slots dataclass; orjson encodes it without an asdict() copy
+        return ORJSONResponse({
             "success": True,
             "turn_result": turn_result,
             "voice_generation": "processing" if request.generate_voice else "disabled",
+            "audio_pending": audio_pending,
             "multiplayer_feature": "AI companions responding",
             "hackathon_demo": "Real-time voice-enabled D&D"
-        }
+        })
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
     except Exception as e:
-        print(f"❌ Unexpected error in player_action: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Unexpected error in player_action")
         raise HTTPException(status_code=500, detail=f"Failed to process action: {str(e)}")
 
-@router.get("/ai-players")
-async def get_ai_party_members() -> Dict[str, Any]:
-    """🤖 Get available AI party members"""
-    
-    ai_players = get_ai_players()
+def _build_ai_players_payload() -> Dict[str, Any]:
+    """Format the AI party roster for /ai-players"""
     
-    formatted_players = []
-    for player in ai_players:
-        formatted_players.append({
+    formatted_players = [
+        {
             "name": player.name,
             "class": player.player_class.value,
             "personality": player.personality.value,
@@ -188,7 +212,9 @@ async def get_ai_party_members() -> Dict[str, Any]:
             "personality_traits": player.personality_traits,
             "combat_style": player.combat_style,
             "roleplay_style": player.roleplay_style
-        })
+        }
+        for player in get_ai_players()
+    ]
     
     return {
         "success": True,
@@ -198,7 +224,16 @@ async def get_ai_party_members() -> Dict[str, Any]:
         "voice_integration": "Each AI has unique voice and personality"
     }
 
-@router.post("/generate-ai-response")
+# The AI roster is static for the life of the process, so encode it once
+_AI_PLAYERS_JSON = orjson.dumps(_build_ai_players_payload())
+
+@router.get("/ai-players", response_model=None)
+async def get_ai_party_members() -> Response:
+    """🤖 Get available AI party members"""
+    
+    return Response(content=_AI_PLAYERS_JSON, media_type="application/json")
+
+@router.post("/generate-ai-response", response_model=None)
 async def generate_ai_response(
     session_id: str,
     ai_player_name: str,
@@ -217,9 +252,9 @@ async def generate_ai_response(
         
         # Generate voice if requested
         if generate_voice and ai_response.get("response"):
-            voice_result = await create_voice_direct(
-                text=ai_response["response"],
-                character_type=ai_response.get("voice_id", "dm_narrator")
+            voice_result = await tts_batcher.submit(
+                ai_response["response"],
+                ai_response.get("voice_id", "dm_narrator")
             )
             
             if voice_result.get("success"):
@@ -237,15 +272,12 @@ async def generate_ai_response(
 
 # === VOICE INTEGRATION ENDPOINTS ===
 
-@router.post("/generate-voice")
-async def generate_voice_for_text(request: VoiceGenerationRequest) -> Dict[str, Any]:
+@router.post("/generate-voice", response_model=None, openapi_extra=json_body_openapi(VoiceGenerationRequest))
+async def generate_voice_for_text(request: VoiceGenerationRequest = json_body(VoiceGenerationRequest)) -> Dict[str, Any]:
     """🎤 Generate voice for specific text and character"""
     
     try:
-        voice_result = await create_voice_direct(
-            text=request.text,
-            character_type=request.voice_id
-        )
+        voice_result = await tts_batcher.submit(request.text, request.voice_id)
         
         return {
             "success": voice_result.get("success", False),
@@ -259,28 +291,14 @@ async def generate_voice_for_text(request: VoiceGenerationRequest) -> Dict[str,
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice generation failed: {str(e)}")
 
-@router.get("/voice-test/{character_type}")
+@router.get("/voice-test/{character_type}", response_model=None)
 async def test_character_voice(character_type: str) -> Dict[str, Any]:
-    """🎭 Test specific character voice"""
-    
-    test_phrases = {
-        "dm_narrator": "Welcome brave adventurers! Your epic quest awaits in the depths of the ancient dungeon!",
-        "dwarf_warrior": "By me beard! I'll smash any foe that stands in our way! Let's show 'em what we're made of!",
-        "elf_mage": "The arcane energies flow through this place... I sense ancient magic and hidden secrets await us.",
-        "human_rogue": "Well, this looks suspiciously like a trap. Good thing I brought my lucky lockpicks and charm!",
-        "wise_elder": "Patience, young ones. Wisdom teaches us that careful observation often reveals the safest path forward.",
-        "dragon": "Foolish mortals... You dare enter my domain? Your treasures will make fine additions to my hoard!",
-        "fairy_companion": "Oh my! This place is simply magical! I can feel the enchantments dancing in the air around us!",
-        "orc_villain": "GRAAHHH! You will pay for your interference! Prepare to face the wrath of the Iron Clan!"
-    }
+    """🎭 Test specific character voice (repeat phrases hit the voice service's TTL cache)"""
     
-    test_text = test_phrases.get(character_type, "Hello adventurers! This is a voice test.")
+    test_text = VOICE_TEST_PHRASES.get(character_type, DEFAULT_VOICE_TEST_PHRASE)
     
     try:
-        voice_result = await create_voice_direct(
-            text=test_text,
-            character_type=character_type
-        )
+        voice_result = await tts_batcher.submit(test_text, character_type)
         
         return {
             "success": voice_result.get("success", False),
@@ -293,33 +311,50 @@ async def test_character_voice(character_type: str) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice test failed: {str(e)}")
 
+@router.get("/tts-metrics", response_model=None)
+async def get_tts_metrics() -> Dict[str, Any]:
+    """📈 TTS dedup counters"""
+    
+    return {
+        "success": True,
+        "tts_batching": tts_batcher.stats()
+    }
+
 # === SESSION MANAGEMENT ENDPOINTS ===
 
-@router.get("/active-sessions")
-async def get_active_sessions() -> Dict[str, Any]:
+@router.get("/active-sessions", response_model=None)
+async def get_active_sessions() -> Response:
     """📋 Get all active multiplayer sessions"""
     
-    sessions = []
-    for session_id, session in multiplayer_manager.active_sessions.items():
-        sessions.append({
-            "session_id": session_id,
-            "human_player": session.human_player_name,
-            "party_size": len(session.ai_players) + 1,
-            "current_turn": session.turn_order[session.current_turn_index] if session.turn_order else "Unknown",
-            "total_turns": session.total_turns,
-            "voice_mode": session.voice_mode,
-            "campaign_title": session.campaign_title,
-            "created_at": session.created_at.isoformat()
-        })
+    def build() -> Dict[str, Any]:
+        cols = multiplayer_manager.columns
+        sessions = [
+            {
+                "session_id": session_id,
+                "human_player": human_player,
+                "party_size": party_size,
+                "current_turn": current_turn,
+                "total_turns": total_turns,
+                "voice_mode": voice_mode,
+                "campaign_title": campaign_title,
+                "created_at": created_at
+            }
+            for session_id, human_player, party_size, current_turn, total_turns, voice_mode, campaign_title, created_at in zip(
+                cols.session_ids, cols.human_players, cols.party_sizes, cols.current_turns,
+                cols.total_turns, cols.voice_modes, cols.campaign_titles, cols.created_at
+            )
+        ]
+        
+        return {
+            "success": True,
+            "active_sessions": sessions,
+            "total_sessions": len(sessions),
+            "multiplayer_system": "Active"
+        }
     
-    return {
-        "success": True,
-        "active_sessions": sessions,
-        "total_sessions": len(sessions),
-        "multiplayer_system": "Active"
-    }
+    return Response(content=_cached_snapshot("active", build), media_type="application/json")
 
-@router.post("/session/{session_id}/toggle-voice")
+@router.post("/session/{session_id}/toggle-voice", response_model=None)
 async def toggle_voice_mode(session_id: str) -> Dict[str, Any]:
     """🔊 Toggle voice mode for session"""
     
@@ -327,7 +362,7 @@ async def toggle_voice_mode(session_id: str) -> Dict[str, Any]:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session.voice_mode = not session.voice_mode
+    multiplayer_manager.set_voice_mode(session, not session.voice_mode)
     
     return {
         "success": True,
@@ -336,14 +371,30 @@ async def toggle_voice_mode(session_id: str) -> Dict[str, Any]:
         "message": f"Voice mode {'enabled' if session.voice_mode else 'disabled'}"
     }
 
-@router.delete("/session/{session_id}")
+@router.get("/session/{session_id}/audio", response_model=None)
+async def get_session_audio(session_id: str, since_turn: int = 0) -> Dict[str, Any]:
+    """🎧 Get voice clips produced by background (voice_async) generation"""
+    
+    if multiplayer_manager.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    clips = [clip for clip in _session_audio.get(session_id, ()) if clip["turn_number"] >= since_turn]
+    
+    return {
+        "success": True,
+        "session_id": session_id,
+        "audio": clips,
+        "pending": _pending_audio.get(session_id, 0)
+    }
+
+@router.delete("/session/{session_id}", response_model=None)
 async def end_session(session_id: str) -> Dict[str, Any]:
     """🏁 End multiplayer session"""
     
-    if session_id in multiplayer_manager.active_sessions:
-        session = multiplayer_manager.active_sessions[session_id]
-        del multiplayer_manager.active_sessions[session_id]
-        
+    session = multiplayer_manager.end_session(session_id)
+    if session:
+        _session_audio.pop(session_id, None)
+        _pending_audio.pop(session_id, None)
         return {
             "success": True,
             "message": f"Session {session_id} ended successfully",
@@ -356,25 +407,31 @@ async def end_session(session_id: str) -> Dict[str, Any]:
     else:
         raise HTTPException(status_code=404, detail="Session not found")
 
-@router.get("/debug/sessions")
-async def debug_active_sessions() -> Dict[str, Any]:
+@router.get("/debug/sessions", response_model=None)
+async def debug_active_sessions():
     """🔍 Debug endpoint to see all active sessions"""
     
-    try:
-        active_sessions = {}
-        for session_id, session in multiplayer_manager.active_sessions.items():
-            active_sessions[session_id] = {
-                "session_id": session.session_id,
-                "human_player": session.human_player_name,
-                "party_size": len(session.ai_players) + 1,
-                "turn_order": session.turn_order,
-                "current_turn_index": session.current_turn_index,
-                "current_turn": session.turn_order[session.current_turn_index] if session.turn_order else "Unknown",
-                "total_turns": session.total_turns,
-                "voice_mode": session.voice_mode,
-                "created_at": session.created_at.isoformat(),
-                "session_state": session.session_state.value if hasattr(session.session_state, 'value') else str(session.session_state)
+    def build() -> Dict[str, Any]:
+        cols = multiplayer_manager.columns
+        active_sessions = {
+            session_id: {
+                "session_id": session_id,
+                "human_player": human_player,
+                "party_size": party_size,
+                "turn_order": turn_order,
+                "current_turn_index": current_turn_index,
+                "current_turn": current_turn,
+                "total_turns": total_turns,
+                "voice_mode": voice_mode,
+                "created_at": created_at,
+                "session_state": session_state
             }
+            for session_id, human_player, party_size, turn_order, current_turn_index, current_turn, total_turns, voice_mode, created_at, session_state in zip(
+                cols.session_ids, cols.human_players, cols.party_sizes, cols.turn_orders,
+                cols.current_turn_indexes, cols.current_turns, cols.total_turns,
+                cols.voice_modes, cols.created_at, cols.session_states
+            )
+        }
         
         return {
             "success": True,
@@ -382,11 +439,13 @@ async def debug_active_sessions() -> Dict[str, Any]:
             "active_sessions": active_sessions,
             "debug_info": "Use this to check if sessions are being stored correctly"
         }
+    
+    try:
+        return Response(content=_cached_snapshot("debug", build), media_type="application/json")
         
     except Exception as e:
-        print(f"❌ Debug sessions error: {str(e)}")
+        logger.exception("❌ Debug sessions error")
         import traceback
-        traceback.print_exc()
         return {
             "success": False,
             "error": str(e),
@@ -395,24 +454,71 @@ async def debug_active_sessions() -> Dict[str, Any]:
 
 # === UTILITY FUNCTIONS ===
 
+# Encoded snapshot payloads keyed by view, tagged with the manager version they were built from
+_snapshot_cache: Dict[str, Tuple[int, bytes]] = {}
+
+def _cached_snapshot(name: str, build: Callable[[], Dict[str, Any]]) -> bytes:
+    """Return the encoded snapshot for a view, rebuilding only after session changes"""
+    version = multiplayer_manager.version
+    cached = _snapshot_cache.get(name)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    body = orjson.dumps(build())
+    _snapshot_cache[name] = (version, body)
+    return body
+
+# Fire-and-forget voice jobs (strong refs so the loop can't drop them), capped so a burst can't queue unbounded work
+MAX_PENDING_VOICE_TASKS = 256
+_voice_tasks: set = set()
+
+# Clips finished by background voice jobs (newest MAX_SESSION_AUDIO_CLIPS kept), and jobs still outstanding, per session
+MAX_SESSION_AUDIO_CLIPS = 64
+_session_audio: Dict[str, Deque[Dict[str, Any]]] = {}
+_pending_audio: Dict[str, int] = {}
+
+def _spawn_voice_task(coro) -> asyncio.Task:
+    """Start a background voice job and keep it referenced until done"""
+    task = asyncio.create_task(coro)
+    _voice_tasks.add(task)
+    task.add_done_callback(_voice_tasks.discard)
+    return task
+
 async def generate_voice_for_response(
     text: str,
     voice_id: str,
     session_id: str,
-    speaker_name: str
+    speaker_name: str,
+    turn_number: int = 0
 ) -> None:
     """Background task to generate voice for responses"""
     try:
-        voice_result = await create_voice_direct(text=text, character_type=voice_id)
-        # Store voice result for retrieval (could be enhanced with caching)
-        if voice_result.get("success"):
-            print(f"✅ Voice generated for {speaker_name} in session {session_id}")
-    except Exception as e:
-        print(f"❌ Voice generation failed for {speaker_name}: {str(e)}")
+        voice_result = await tts_batcher.submit(text, voice_id)
+        # Store voice result for retrieval via /session/{id}/audio
+        if voice_result.get("success") and multiplayer_manager.get_session(session_id) is not None:
+            clips = _session_audio.get(session_id)
+            if clips is None:
+                clips = _session_audio[session_id] = deque(maxlen=MAX_SESSION_AUDIO_CLIPS)
+            clips.append({
+                "turn_number": turn_number,
+                "speaker": speaker_name,
+                "audio_url": voice_result.get("audio_url")
+            })
+            logger.debug("✅ Voice generated for %s in session %s", speaker_name, session_id)
+    except Exception:
+        logger.exception("❌ Voice generation failed for %s", speaker_name)
+    finally:
+        # end_session already dropped the counter - don't bring it back
+        pending = _pending_audio.get(session_id)
+        if pending is not None:
+            if pending > 1:
+                _pending_audio[session_id] = pending - 1
+            else:
+                del _pending_audio[session_id]
 
 # === DEMO ENDPOINTS ===
 
-@router.post("/demo/quick-session")
+@router.post("/demo/quick-session", response_model=None)
 async def create_demo_session() -> Dict[str, Any]:
     """🎯 Create quick demo session for hackathon demonstration"""
     
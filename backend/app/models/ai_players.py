@@ -3,10 +3,12 @@ AI Player Characters for Multiplayer D&D Sessions
 Each AI player has unique personality, voice, and gameplay mechanics
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
+import functools
 import random
+import re
 
 class AIPlayerClass(Enum):
     WARRIOR = "warrior"
@@ -22,7 +24,7 @@ class AIPersonality(Enum):
     AGGRESSIVE = "aggressive"
     PROTECTIVE = "protective"
 
-@dataclass
+@dataclass(slots=True)
 class AIPlayer:
     """AI Player Character with full D&D capabilities"""
     
@@ -40,22 +42,261 @@ class AIPlayer:
     
     # Voice & Personality
     voice_description: str = ""
-    personality_traits: List[str] = None
+    personality_traits: List[str] = field(default_factory=list)
     combat_style: str = ""
     roleplay_style: str = ""
     
     # Equipment
-    weapons: List[str] = None
+    weapons: List[str] = field(default_factory=list)
     armor: str = ""
-    items: List[str] = None
+    items: List[str] = field(default_factory=list)
+    
+    # Per-turn response fields that never change, with enum values resolved once
+    _static_response: Dict[str, Any] = field(init=False, repr=False, compare=False, default=None)
     
     def __post_init__(self):
-        if self.personality_traits is None:
-            self.personality_traits = []
-        if self.weapons is None:
-            self.weapons = []
-        if self.items is None:
-            self.items = []
+        self._static_response = {
+            "player_name": self.name,
+            "player_class": self.player_class.value,
+            "personality": self.personality.value,
+            "voice_id": self.voice_id,
+            "voice_ready": True
+        }
+
+# Canned lines per personality and situation type
+_PERSONALITY_RESPONSES = {
+    AIPersonality.BRAVE: {
+        "combat": [
+            "Let's charge in and show them what we're made of!",
+            "I'll lead the charge! Follow me, companions!",
+            "No enemy can stand against our united strength!"
+        ],
+        "exploration": [
+            "I say we press forward! Adventure awaits!",
+            "Whatever lies ahead, we'll face it together!",
+            "Bold action is the path to glory!"
+        ],
+        "social": [
+            "Let me speak for the party - we mean business!",
+            "We stand united in our cause!",
+            "Honor and courage guide our path!"
+        ]
+    },
+    
+    AIPersonality.WISE: {
+        "combat": [
+            "Let us think strategically about this encounter.",
+            "Knowledge of our foe will serve us better than rash action.",
+            "Ancient wisdom teaches patience in battle."
+        ],
+        "exploration": [
+            "These ancient markings suggest we should proceed carefully.",
+            "The arcane energies here are... unusual. We must be cautious.",
+            "My studies have prepared me for such mysteries."
+        ],
+        "social": [
+            "Perhaps diplomacy would serve us better than force.",
+            "Let us hear all perspectives before deciding.",
+            "Wisdom often lies in understanding others."
+        ]
+    },
+    
+    AIPersonality.WITTY: {
+        "combat": [
+            "Well, this looks like fun! Anyone else excited about potential death?",
+            "I vote we try the 'not dying' strategy. Anyone else on board?",
+            "Great, another chance to test my running speed!"
+        ],
+        "exploration": [
+            "Nothing says 'adventure' like a suspiciously convenient entrance!",
+            "I love when ancient places look this welcoming and safe.",
+            "What could possibly go wrong? Famous last words, party!"
+        ],
+        "social": [
+            "I'm sure this conversation will go perfectly smoothly.",
+            "Let me handle this with my legendary charm and tact.",
+            "Time to deploy my secret weapon: sarcasm!"
+        ]
+    },
+    
+    AIPersonality.PROTECTIVE: {
+        "combat": [
+            "Stay close, my friends. I'll keep you safe.",
+            "May the divine light protect us in this battle.",
+            "I call upon sacred power to shield our party!"
+        ],
+        "exploration": [
+            "Let me check for dangers before we proceed.",
+            "The gods watch over righteous travelers.",
+            "I sense we are not alone here. Stay vigilant."
+        ],
+        "social": [
+            "Let us approach with open hearts and peaceful intent.",
+            "All souls deserve compassion and understanding.",
+            "May we find common ground in this exchange."
+        ]
+    }
+}
+
+
+def _dwarven(line: str) -> str:
+    """Warrior dialect: whole-word you/your -> ye/yer (leaves "yours" alone)"""
+    return re.sub(r"\byour\b", "yer", re.sub(r"\byou\b", "ye", line))
+
+# Flat (personality, situation type) -> candidate lines, as immutable tuples
+_RESPONSES = {
+    (personality, situation_type): tuple(lines)
+    for personality, by_situation in _PERSONALITY_RESPONSES.items()
+    for situation_type, lines in by_situation.items()
+}
+
+# Warrior line pools: each line next to its dialect variant, so one choice
+# gives the same 50/50 split the runtime coin flip used to
+_WARRIOR_VARIANTS = {
+    key: tuple(
+        variant
+        for line in lines
+        for variant in (line, line if "ye" in line else _dwarven(line))
+    )
+    for key, lines in _RESPONSES.items()
+}
+
+# Situation keywords by tag, matched as substrings of the lowercased situation ("attacks" counts as "attack").
+# "battle" sets the combat mood but, unlike the others, doesn't trigger a combat action.
+_SITUATION_KEYWORDS = {
+    "attack": ("fight", "combat", "attack", "enemy"),
+    "battle": ("battle",),
+    "social": ("talk", "speak", "negotiate", "conversation", "meet"),
+    "heal": ("heal", "hurt", "injured", "damage"),
+    "explore": ("investigate", "search", "explore")
+}
+
+# All keywords in one alternation so a single scan finds every tag present
+_SITUATION_RE = re.compile("|".join(
+    f"(?P<{tag}>{'|'.join(map(re.escape, words))})"
+    for tag, words in _SITUATION_KEYWORDS.items()
+))
+
+# Action chosen by each class when the situation calls for a fight
+_COMBAT_ACTIONS = {
+    AIPlayerClass.WARRIOR: "melee_attack",
+    AIPlayerClass.MAGE: "cast_spell",
+    AIPlayerClass.ROGUE: "sneak_attack",
+    AIPlayerClass.CLERIC: "support_party"
+}
+
+@functools.lru_cache(maxsize=1024)
+def _classify_situation(situation_lower: str) -> Tuple[frozenset, str]:
+    """Keyword tags (one regex pass) and situation type for an already lowercased situation"""
+    tags = frozenset(match.lastgroup for match in _SITUATION_RE.finditer(situation_lower))
+    
+    situation_type = "exploration"  # default
+    if "attack" in tags or "battle" in tags:
+        situation_type = "combat"
+    elif "social" in tags:
+        situation_type = "social"
+    
+    return tags, situation_type
+
+def _build_default_party() -> Dict[str, AIPlayer]:
+    """Create the default AI party members"""
+    
+    return {
+        "thorgar": AIPlayer(
+            name="Thorgar Ironbeard",
+            player_class=AIPlayerClass.WARRIOR,
+            personality=AIPersonality.BRAVE,
+            voice_id="dwarf_warrior",
+            level=3,
+            hp=120,
+            max_hp=120,
+            ac=18,
+            voice_description="⚔️ Gruff Dwarf Warrior - Bold and battle-hardened",
+            personality_traits=[
+                "Never backs down from a fight",
+                "Extremely loyal to party members", 
+                "Loves ale and telling war stories",
+                "Speaks in a gruff, direct manner"
+            ],
+            combat_style="Aggressive front-line fighter, prefers melee combat",
+            roleplay_style="Speaks with dwarven accent, protective of party",
+            weapons=["Enchanted War Hammer", "Shield of Protection"],
+            armor="Plate Mail Armor",
+            items=["Healing Potions x3", "Rope", "Dwarven Ale"]
+        ),
+        
+        "elara": AIPlayer(
+            name="Elara Moonwhisper",
+            player_class=AIPlayerClass.MAGE,
+            personality=AIPersonality.WISE,
+            voice_id="elf_mage",
+            level=3,
+            hp=80,
+            max_hp=80,
+            ac=12,
+            voice_description="✨ Elegant Elf Mage - Mystical and wise",
+            personality_traits=[
+                "Thoughtful and strategic in approach",
+                "Fascinated by ancient magic and lore",
+                "Often provides sage advice to the party",
+                "Speaks eloquently with wisdom"
+            ],
+            combat_style="Ranged spellcaster, prefers tactical magic",
+            roleplay_style="Speaks with elvish grace, offers magical insights",
+            weapons=["Staff of Arcane Power", "Crystal Orb"],
+            armor="Robes of Protection",
+            items=["Spellbook", "Magical Components", "Scrolls x5"]
+        ),
+        
+        "zara": AIPlayer(
+            name="Zara Swiftblade",
+            player_class=AIPlayerClass.ROGUE,
+            personality=AIPersonality.WITTY,
+            voice_id="human_rogue", 
+            level=3,
+            hp=90,
+            max_hp=90,
+            ac=16,
+            voice_description="🗡️ Cunning Human Rogue - Quick and clever",
+            personality_traits=[
+                "Quick-witted with a sharp tongue",
+                "Expert at finding creative solutions",
+                "Loves treasure and shiny objects", 
+                "Makes jokes even in dangerous situations"
+            ],
+            combat_style="Stealth and precision strikes, avoids direct combat",
+            roleplay_style="Sarcastic humor, always looking for profit",
+            weapons=["Twin Daggers", "Shortbow"],
+            armor="Leather Armor",
+            items=["Thieves' Tools", "Caltrops", "Smoke Bombs x3"]
+        ),
+        
+        "brother_marcus": AIPlayer(
+            name="Brother Marcus",
+            player_class=AIPlayerClass.CLERIC,
+            personality=AIPersonality.PROTECTIVE,
+            voice_id="wise_elder",
+            level=3,
+            hp=100,
+            max_hp=100,
+            ac=16,
+            voice_description="📚 Wise Elder - Ancient knowledge keeper",
+            personality_traits=[
+                "Deeply religious and moral",
+                "Always helps party members in need",
+                "Provides spiritual guidance and healing",
+                "Speaks with calm wisdom and compassion"
+            ],
+            combat_style="Support and healing, defensive combat when needed",
+            roleplay_style="Offers blessings and moral guidance",
+            weapons=["Holy Mace", "Shield of Faith"],
+            armor="Chain Mail", 
+            items=["Holy Symbol", "Healing Herbs", "Prayer Beads"]
+        )
+    }
+
+# Built once at import; each manager gets its own copies
+_DEFAULT_PARTY_TEMPLATE = _build_default_party()
 
 class AIPlayerManager:
     """Manages AI players in multiplayer D&D sessions"""
@@ -63,268 +304,107 @@ class AIPlayerManager:
     def __init__(self):
         self.ai_players = self._create_default_party()
         self.current_speaker = None
+        # Case-folded display name -> player, rebuilt whenever ai_players changes
+        self._name_index = self._build_name_index()
+        self._rng = random.Random()
+        # Response cache: (player name, situation) -> (player, candidate lines, action type).
+        # Whole response dicts are not cached - the random pick happens after lookup so
+        # repeated situations still get varied lines. Context never affects the lines, so it
+        # is not part of the key.
+        self._plan_turn = functools.lru_cache(maxsize=1024)(self._build_turn_plan)
         
     def _create_default_party(self) -> Dict[str, AIPlayer]:
-        """Create the default AI party members"""
+        """Copy the default AI party from the template (only the mutable lists are duplicated)"""
         
         return {
-            "thorgar": AIPlayer(
-                name="Thorgar Ironbeard",
-                player_class=AIPlayerClass.WARRIOR,
-                personality=AIPersonality.BRAVE,
-                voice_id="dwarf_warrior",
-                level=3,
-                hp=120,
-                max_hp=120,
-                ac=18,
-                voice_description="⚔️ Gruff Dwarf Warrior - Bold and battle-hardened",
-                personality_traits=[
-                    "Never backs down from a fight",
-                    "Extremely loyal to party members", 
-                    "Loves ale and telling war stories",
-                    "Speaks in a gruff, direct manner"
-                ],
-                combat_style="Aggressive front-line fighter, prefers melee combat",
-                roleplay_style="Speaks with dwarven accent, protective of party",
-                weapons=["Enchanted War Hammer", "Shield of Protection"],
-                armor="Plate Mail Armor",
-                items=["Healing Potions x3", "Rope", "Dwarven Ale"]
-            ),
-            
-            "elara": AIPlayer(
-                name="Elara Moonwhisper",
-                player_class=AIPlayerClass.MAGE,
-                personality=AIPersonality.WISE,
-                voice_id="elf_mage",
-                level=3,
-                hp=80,
-                max_hp=80,
-                ac=12,
-                voice_description="✨ Elegant Elf Mage - Mystical and wise",
-                personality_traits=[
-                    "Thoughtful and strategic in approach",
-                    "Fascinated by ancient magic and lore",
-                    "Often provides sage advice to the party",
-                    "Speaks eloquently with wisdom"
-                ],
-                combat_style="Ranged spellcaster, prefers tactical magic",
-                roleplay_style="Speaks with elvish grace, offers magical insights",
-                weapons=["Staff of Arcane Power", "Crystal Orb"],
-                armor="Robes of Protection",
-                items=["Spellbook", "Magical Components", "Scrolls x5"]
-            ),
-            
-            "zara": AIPlayer(
-                name="Zara Swiftblade",
-                player_class=AIPlayerClass.ROGUE,
-                personality=AIPersonality.WITTY,
-                voice_id="human_rogue", 
-                level=3,
-                hp=90,
-                max_hp=90,
-                ac=16,
-                voice_description="🗡️ Cunning Human Rogue - Quick and clever",
-                personality_traits=[
-                    "Quick-witted with a sharp tongue",
-                    "Expert at finding creative solutions",
-                    "Loves treasure and shiny objects", 
-                    "Makes jokes even in dangerous situations"
-                ],
-                combat_style="Stealth and precision strikes, avoids direct combat",
-                roleplay_style="Sarcastic humor, always looking for profit",
-                weapons=["Twin Daggers", "Shortbow"],
-                armor="Leather Armor",
-                items=["Thieves' Tools", "Caltrops", "Smoke Bombs x3"]
-            ),
-            
-            "brother_marcus": AIPlayer(
-                name="Brother Marcus",
-                player_class=AIPlayerClass.CLERIC,
-                personality=AIPersonality.PROTECTIVE,
-                voice_id="wise_elder",
-                level=3,
-                hp=100,
-                max_hp=100,
-                ac=16,
-                voice_description="📚 Wise Elder - Ancient knowledge keeper",
-                personality_traits=[
-                    "Deeply religious and moral",
-                    "Always helps party members in need",
-                    "Provides spiritual guidance and healing",
-                    "Speaks with calm wisdom and compassion"
-                ],
-                combat_style="Support and healing, defensive combat when needed",
-                roleplay_style="Offers blessings and moral guidance",
-                weapons=["Holy Mace", "Shield of Faith"],
-                armor="Chain Mail", 
-                items=["Holy Symbol", "Healing Herbs", "Prayer Beads"]
+            key: replace(
+                player,
+                personality_traits=list(player.personality_traits),
+                weapons=list(player.weapons),
+                items=list(player.items)
             )
+            for key, player in _DEFAULT_PARTY_TEMPLATE.items()
         }
     
     def get_party_members(self) -> List[AIPlayer]:
         """Get all AI party members"""
         return list(self.ai_players.values())
     
+    def _build_name_index(self) -> Dict[str, AIPlayer]:
+        """Index players by case-folded name"""
+        return {player.name.casefold(): player for player in self.ai_players.values()}
+    
     def get_player_by_name(self, name: str) -> Optional[AIPlayer]:
-        """Get AI player by name"""
-        for player in self.ai_players.values():
-            if player.name.lower() == name.lower():
-                return player
-        return None
+        """Get AI player by name (case-insensitive)"""
+        return self._name_index.get(name.casefold())
     
     def generate_ai_response(
         self, 
         player_name: str, 
         situation: str, 
-        context: str = ""
+        context: str = "",
+        situation_lower: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate AI player response to situation"""
+        """Generate AI player response to situation (pass situation_lower when already normalized)"""
         
-        player = self.get_player_by_name(player_name)
-        if not player:
+        if situation_lower is None:
+            situation_lower = situation.lower()
+        plan = self._plan_turn(player_name.casefold(), situation_lower)
+        if plan is None:
             return {"error": "Player not found"}
         
         # Generate personality-based response
-        response = self._create_character_response(player, situation, context)
+        player, responses, action_type = plan
+        response = self._rng.choice(responses)
         
-        return {
-            "player_name": player.name,
-            "player_class": player.player_class.value,
-            "personality": player.personality.value,
-            "voice_id": player.voice_id,
-            "response": response,
-            "action_type": self._determine_action_type(player, situation),
-            "voice_ready": True,
-            "character_stats": {
-                "hp": player.hp,
-                "max_hp": player.max_hp,
-                "ac": player.ac,
-                "level": player.level
-            }
+        result = player._static_response.copy()
+        result["response"] = response
+        result["action_type"] = action_type
+        result["character_stats"] = {
+            "hp": player.hp,
+            "max_hp": player.max_hp,
+            "ac": player.ac,
+            "level": player.level
         }
+        return result
     
-    def _create_character_response(
-        self, 
-        player: AIPlayer, 
-        situation: str, 
-        context: str
-    ) -> str:
-        """Create character-specific response based on personality"""
-        
-        personality_responses = {
-            AIPersonality.BRAVE: {
-                "combat": [
-                    "Let's charge in and show them what we're made of!",
-                    "I'll lead the charge! Follow me, companions!",
-                    "No enemy can stand against our united strength!"
-                ],
-                "exploration": [
-                    "I say we press forward! Adventure awaits!",
-                    "Whatever lies ahead, we'll face it together!",
-                    "Bold action is the path to glory!"
-                ],
-                "social": [
-                    "Let me speak for the party - we mean business!",
-                    "We stand united in our cause!",
-                    "Honor and courage guide our path!"
-                ]
-            },
-            
-            AIPersonality.WISE: {
-                "combat": [
-                    "Let us think strategically about this encounter.",
-                    "Knowledge of our foe will serve us better than rash action.",
-                    "Ancient wisdom teaches patience in battle."
-                ],
-                "exploration": [
-                    "These ancient markings suggest we should proceed carefully.",
-                    "The arcane energies here are... unusual. We must be cautious.",
-                    "My studies have prepared me for such mysteries."
-                ],
-                "social": [
-                    "Perhaps diplomacy would serve us better than force.",
-                    "Let us hear all perspectives before deciding.",
-                    "Wisdom often lies in understanding others."
-                ]
-            },
-            
-            AIPersonality.WITTY: {
-                "combat": [
-                    "Well, this looks like fun! Anyone else excited about potential death?",
-                    "I vote we try the 'not dying' strategy. Anyone else on board?",
-                    "Great, another chance to test my running speed!"
-                ],
-                "exploration": [
-                    "Nothing says 'adventure' like a suspiciously convenient entrance!",
-                    "I love when ancient places look this welcoming and safe.",
-                    "What could possibly go wrong? Famous last words, party!"
-                ],
-                "social": [
-                    "I'm sure this conversation will go perfectly smoothly.",
-                    "Let me handle this with my legendary charm and tact.",
-                    "Time to deploy my secret weapon: sarcasm!"
-                ]
-            },
-            
-            AIPersonality.PROTECTIVE: {
-                "combat": [
-                    "Stay close, my friends. I'll keep you safe.",
-                    "May the divine light protect us in this battle.",
-                    "I call upon sacred power to shield our party!"
-                ],
-                "exploration": [
-                    "Let me check for dangers before we proceed.",
-                    "The gods watch over righteous travelers.",
-                    "I sense we are not alone here. Stay vigilant."
-                ],
-                "social": [
-                    "Let us approach with open hearts and peaceful intent.",
-                    "All souls deserve compassion and understanding.",
-                    "May we find common ground in this exchange."
-                ]
-            }
-        }
+    def _build_turn_plan(
+        self,
+        player_key: str,
+        situation_lower: str
+    ) -> Optional[Tuple[AIPlayer, Tuple[str, ...], str]]:
+        """Resolve player, response pool and action type for a situation (cached by _plan_turn)"""
         
-        # Determine situation type
-        situation_type = "exploration"  # default
-        if any(word in situation.lower() for word in ["fight", "combat", "attack", "enemy", "battle"]):
-            situation_type = "combat"
-        elif any(word in situation.lower() for word in ["talk", "speak", "negotiate", "conversation", "meet"]):
-            situation_type = "social"
-        
-        # Get appropriate responses for personality and situation
-        responses = personality_responses.get(player.personality, {}).get(situation_type, [
-            f"{player.name} considers the situation carefully."
-        ])
-        
-        base_response = random.choice(responses)
+        player = self._name_index.get(player_key)
+        if not player:
+            return None
         
-        # Add character-specific flair
-        if player.player_class == AIPlayerClass.WARRIOR:
-            if "ye" not in base_response and random.choice([True, False]):
-                base_response = base_response.replace("you", "ye").replace("your", "yer")
+        tags, situation_type = _classify_situation(situation_lower)
+        return (
+            player,
+            self._character_responses(player, situation_type),
+            self._determine_action_type(player, tags)
+        )
+    
+    def _character_responses(self, player: AIPlayer, situation_type: str) -> Tuple[str, ...]:
+        """Candidate character-specific responses based on personality"""
         
-        return base_response
+        # Get appropriate responses for personality and situation (warriors get dialect flair)
+        table = _WARRIOR_VARIANTS if player.player_class is AIPlayerClass.WARRIOR else _RESPONSES
+        return table.get((player.personality, situation_type)) or (f"{player.name} considers the situation carefully.",)
     
-    def _determine_action_type(self, player: AIPlayer, situation: str) -> str:
-        """Determine what type of action the AI player wants to take"""
+    def _determine_action_type(self, player: AIPlayer, tags: frozenset) -> str:
+        """Determine what type of action the AI player wants to take from the situation tags"""
         
-        if any(word in situation.lower() for word in ["fight", "combat", "attack", "enemy"]):
-            if player.player_class == AIPlayerClass.WARRIOR:
-                return "melee_attack"
-            elif player.player_class == AIPlayerClass.MAGE:
-                return "cast_spell"
-            elif player.player_class == AIPlayerClass.ROGUE:
-                return "sneak_attack"
-            elif player.player_class == AIPlayerClass.CLERIC:
-                return "support_party"
+        if "attack" in tags:
+            return _COMBAT_ACTIONS.get(player.player_class, "roleplay")
         
-        elif any(word in situation.lower() for word in ["heal", "hurt", "injured", "damage"]):
-            if player.player_class == AIPlayerClass.CLERIC:
+        elif "heal" in tags:
+            if player.player_class is AIPlayerClass.CLERIC:
                 return "heal_party"
         
-        elif any(word in situation.lower() for word in ["investigate", "search", "explore"]):
-            if player.player_class == AIPlayerClass.ROGUE:
+        elif "explore" in tags:
+            if player.player_class is AIPlayerClass.ROGUE:
                 return "search_area"
         
         return "roleplay"
@@ -340,7 +420,8 @@ def get_ai_players() -> List[AIPlayer]:
 def generate_ai_player_response(
     player_name: str, 
     situation: str, 
-    context: str = ""
+    context: str = "",
+    situation_lower: Optional[str] = None
 ) -> Dict[str, Any]:
     """Generate AI player response with voice"""
-    return ai_player_manager.generate_ai_response(player_name, situation, context) 
\ No newline at end of file
+    return ai_player_manager.generate_ai_response(player_name, situation, context, situation_lower) 
\ No newline at end of file
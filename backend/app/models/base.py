@@ -0,0 +1,63 @@
+"""
+Shared Pydantic v2 base for game state models
+"""
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
+from datetime import datetime
+from typing import Any, List, Union
+import os
+import time
+
+# Ids are cut from one os.urandom read per ID_POOL_SIZE ids
+ID_POOL_SIZE = 256
+_id_pool: List[str] = []
+
+def new_id() -> str:
+    """Random model id (32-char hex, 128 random bits)"""
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        block = os.urandom(16 * ID_POOL_SIZE).hex()
+        _id_pool.extend(block[i:i + 32] for i in range(32, len(block), 32))
+        return block[:32]
+
+# A forked worker must not hand out the ids its parent already pooled
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_id_pool.clear)
+
+class GameModel(BaseModel):
+    """Mutable game-state model - validated on construction, not on every field write"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, arbitrary_types_allowed=True)
+
+class TimestampedModel(GameModel):
+    """Game model whose last-modified time is kept as integer nanoseconds, converted only when read"""
+    updated_at_ns: int = Field(default_factory=time.time_ns, exclude=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_updated_at(cls, data: Any) -> Any:
+        """Keep a dumped/client-supplied updated_at instead of resetting it to now"""
+        if isinstance(data, dict) and "updated_at" in data and "updated_at_ns" not in data:
+            data = dict(data)
+            data["updated_at_ns"] = _to_ns(data.pop("updated_at"))
+        return data
+
+    def touch(self):
+        """Mark the model as modified now (call once per batch of changes)"""
+        self.updated_at_ns = time.time_ns()
+
+    @computed_field
+    @property
+    def updated_at(self) -> datetime:
+        seconds, ns = divmod(self.updated_at_ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime):
+        self.updated_at_ns = _to_ns(value)
+
+def _to_ns(value: Union[datetime, str]) -> int:
+    """Integer epoch nanoseconds for a datetime or ISO string (exact to the microsecond)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.replace(microsecond=0).timestamp()) * 1_000_000_000 + value.microsecond * 1000
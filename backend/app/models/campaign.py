@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer, field_validator
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
-import uuid
 from datetime import datetime
 
+from .base import GameModel, TimestampedModel, new_id
+
 class CampaignStatus(str, Enum):
     PLANNING = "planning"
     ACTIVE = "active" 
@@ -17,67 +18,73 @@ class SessionStatus(str, Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
-class GameEvent(BaseModel):
+class QuestStatus(str, Enum):
+    AVAILABLE = "available"
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class GameEvent(GameModel):
     """Represents a significant event in the campaign"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     timestamp: datetime = Field(default_factory=datetime.now)
     event_type: str  # "combat", "social", "exploration", "story"
     description: str
-    participants: List[str] = Field(default_factory=list)  # character IDs
+    participants: Tuple[str, ...] = ()  # character IDs
     location: Optional[str] = None
     consequences: Optional[str] = None
 
-class NPC(BaseModel):
+class NPC(GameModel):
     """Non-Player Character"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     race: str = "human"
     occupation: str = "commoner"
     location: str = "unknown"
-    personality_traits: List[str] = Field(default_factory=list)
+    personality_traits: Tuple[str, ...] = ()
     relationship_status: str = "neutral"  # friendly, neutral, hostile
     notes: str = ""
     
-class Location(BaseModel):
+class Location(GameModel):
     """Campaign location/setting"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     location_type: str = "settlement"  # settlement, dungeon, wilderness, etc.
     parent_location: Optional[str] = None  # ID of parent location
-    connected_locations: List[str] = Field(default_factory=list)
-    npcs: List[str] = Field(default_factory=list)  # NPC IDs
-    points_of_interest: List[str] = Field(default_factory=list)
+    connected_locations: Tuple[str, ...] = ()
+    npcs: Tuple[str, ...] = ()  # NPC IDs
+    points_of_interest: Tuple[str, ...] = ()
     notes: str = ""
 
-class Quest(BaseModel):
+class Quest(GameModel):
     """Campaign quest/mission"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     quest_giver: Optional[str] = None  # NPC ID
-    status: str = "available"  # available, active, completed, failed
-    objectives: List[str] = Field(default_factory=list)
-    rewards: List[str] = Field(default_factory=list)
+    status: QuestStatus = QuestStatus.AVAILABLE
+    objectives: Tuple[str, ...] = ()
+    rewards: Tuple[str, ...] = ()
     location: Optional[str] = None
     level_requirement: int = 1
     notes: str = ""
 
-class CombatEncounter(BaseModel):
+class CombatEncounter(GameModel):
     """Combat encounter definition"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     enemies: List[Dict[str, Any]] = Field(default_factory=list)
     difficulty: str = "medium"  # easy, medium, hard, deadly
     environment: str = "open"
-    special_conditions: List[str] = Field(default_factory=list)
-    treasure: List[str] = Field(default_factory=list)
+    special_conditions: Tuple[str, ...] = ()
+    treasure: Tuple[str, ...] = ()
 
-class GameSession(BaseModel):
+class GameSession(GameModel):
     """Individual game session"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     campaign_id: str
     session_number: int
     name: str = ""
@@ -108,9 +115,9 @@ class GameSession(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
-class Campaign(BaseModel):
+class Campaign(TimestampedModel):
     """D&D Campaign"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=new_id)
     name: str
     description: str
     setting: str = "Forgotten Realms"
@@ -121,10 +128,10 @@ class Campaign(BaseModel):
     end_date: Optional[datetime] = None
     current_level: int = 1
     
-    # Participants
+    # Participants (ordered sets: id -> None; serialized as lists)
     dm_id: str  # Dungeon Master
-    player_ids: List[str] = Field(default_factory=list)
-    character_ids: List[str] = Field(default_factory=list)
+    player_ids: Dict[str, None] = Field(default_factory=dict)
+    character_ids: Dict[str, None] = Field(default_factory=dict)
     
     # World Building
     locations: List[Location] = Field(default_factory=list)
@@ -133,7 +140,7 @@ class Campaign(BaseModel):
     encounters: List[CombatEncounter] = Field(default_factory=list)
     
     # Campaign Progress
-    sessions: List[str] = Field(default_factory=list)  # Session IDs
+    sessions: Dict[str, None] = Field(default_factory=dict)  # Session IDs (ordered set)
     current_session_id: Optional[str] = None
     story_arc: str = ""
     campaign_notes: str = ""
@@ -145,38 +152,104 @@ class Campaign(BaseModel):
     
     # Meta
     created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    
+    @field_validator("player_ids", "character_ids", "sessions", mode="before")
+    @classmethod
+    def _ordered_id_set(cls, value: Any) -> Any:
+        """Accept id lists (the serialized form) as ordered sets"""
+        if isinstance(value, (list, tuple, set)):
+            return dict.fromkeys(value)
+        return value
+    
+    @field_serializer("player_ids", "character_ids", "sessions")
+    def _id_list(self, value: Dict[str, None]) -> List[str]:
+        """Serialize ordered id sets back to plain lists"""
+        return list(value)
+    
+    # Quest indexes: status -> {quest id: quest} in list order, plus the (quest, status, level)
+    # each entry was indexed under, so direct edits to self.quests or a quest are detected
+    _status_index: Dict[QuestStatus, Dict[str, Quest]] = PrivateAttr(default_factory=dict)
+    _indexed_as: List[Tuple[Quest, QuestStatus, int]] = PrivateAttr(default_factory=list)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._reindex_quests()
+    
+    def _reindex_quests(self):
+        """Rebuild the quest indexes from self.quests"""
+        self._status_index = {}
+        self._indexed_as = []
+        for quest in self.quests:
+            self._index_quest(quest)
+    
+    def _index_quest(self, quest: Quest):
+        """Add one quest (at the end of list order) to the indexes under its current status"""
+        # Plain strings assigned to quest.status are normalised to the enum member
+        status = quest.status = QuestStatus(quest.status)
+        self._status_index.setdefault(status, {})[quest.id] = quest
+        self._indexed_as.append((quest, status, quest.level_requirement))
+    
+    def _ensure_quest_index(self):
+        """Rebuild the quest indexes if self.quests or any quest's status/level changed behind our back"""
+        indexed_as = self._indexed_as
+        quests = self.quests
+        if len(indexed_as) != len(quests) or not all(
+            indexed is quest and status == quest.status and level == quest.level_requirement
+            for (indexed, status, level), quest in zip(indexed_as, quests)
+        ):
+            self._reindex_quests()
+    
+    def add_quest(self, quest: Quest):
+        """Add a quest to the campaign"""
+        self._ensure_quest_index()
+        self.quests.append(quest)
+        self._index_quest(quest)
+        self.touch()
+    
+    def set_quest_status(self, quest_id: str, status: QuestStatus) -> Optional[Quest]:
+        """Change a quest's status, keeping the indexes in step"""
+        self._ensure_quest_index()
+        quest = next(
+            (bucket[quest_id] for bucket in self._status_index.values() if quest_id in bucket),
+            None
+        )
+        if quest is None:
+            return None
+        quest.status = QuestStatus(status)
+        # Rebuild so every status bucket keeps list order
+        self._reindex_quests()
+        self.touch()
+        return quest
     
     def add_player(self, player_id: str, character_id: str):
         """Add a player and their character to the campaign"""
-        if player_id not in self.player_ids:
-            self.player_ids.append(player_id)
-        if character_id not in self.character_ids:
-            self.character_ids.append(character_id)
-        self.updated_at = datetime.now()
+        self.player_ids[player_id] = None
+        self.character_ids[character_id] = None
+        self.touch()
     
     def remove_player(self, player_id: str, character_id: str):
         """Remove a player and their character from the campaign"""
-        if player_id in self.player_ids:
-            self.player_ids.remove(player_id)
-        if character_id in self.character_ids:
-            self.character_ids.remove(character_id)
-        self.updated_at = datetime.now()
+        self.player_ids.pop(player_id, None)
+        self.character_ids.pop(character_id, None)
+        self.touch()
     
     def add_session(self, session_id: str):
         """Add a session to the campaign"""
-        if session_id not in self.sessions:
-            self.sessions.append(session_id)
-        self.updated_at = datetime.now()
+        self.sessions[session_id] = None
+        self.touch()
     
     def get_active_quests(self) -> List[Quest]:
         """Get all active quests"""
-        return [quest for quest in self.quests if quest.status == "active"]
+        self._ensure_quest_index()
+        return list(self._status_index.get(QuestStatus.ACTIVE, {}).values())
     
     def get_available_quests(self) -> List[Quest]:
         """Get all available quests for the current level"""
-        return [quest for quest in self.quests 
-                if quest.status == "available" and quest.level_requirement <= self.current_level]
+        self._ensure_quest_index()
+        current_level = self.current_level
+        return [
+            quest for quest in self._status_index.get(QuestStatus.AVAILABLE, {}).values()
+            if quest.level_requirement <= current_level
+        ]
 
 # Request/Response models
 class CampaignCreate(BaseModel):
@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
-import uuid
 from datetime import datetime
+import numpy as np
+
+from .base import GameModel, TimestampedModel, new_id
+from .character_kernels import skill_bonuses
 
 class CharacterClass(str, Enum):
     BARBARIAN = "barbarian"
@@ -29,7 +33,19 @@ class Race(str, Enum):
     HALF_ORC = "half-orc"
     TIEFLING = "tiefling"
 
-class AbilityScores(BaseModel):
+# Map skills to their governing abilities
+SKILL_ABILITIES = {
+    "athletics": "strength",
+    "acrobatics": "dexterity", "sleight_of_hand": "dexterity", "stealth": "dexterity",
+    "arcana": "intelligence", "history": "intelligence", "investigation": "intelligence",
+    "nature": "intelligence", "religion": "intelligence",
+    "animal_handling": "wisdom", "insight": "wisdom", "medicine": "wisdom",
+    "perception": "wisdom", "survival": "wisdom",
+    "deception": "charisma", "intimidation": "charisma", "performance": "charisma",
+    "persuasion": "charisma"
+}
+
+class AbilityScores(GameModel):
     strength: int = Field(default=10, ge=1, le=30)
     dexterity: int = Field(default=10, ge=1, le=30)
     constitution: int = Field(default=10, ge=1, le=30)
@@ -42,36 +58,65 @@ class AbilityScores(BaseModel):
         score = getattr(self, ability.lower())
         return (score - 10) // 2
 
-class Skills(BaseModel):
-    # Strength
-    athletics: int = 0
-    
-    # Dexterity
-    acrobatics: int = 0
-    sleight_of_hand: int = 0
-    stealth: int = 0
-    
-    # Intelligence
-    arcana: int = 0
-    history: int = 0
-    investigation: int = 0
-    nature: int = 0
-    religion: int = 0
-    
-    # Wisdom
-    animal_handling: int = 0
-    insight: int = 0
-    medicine: int = 0
-    perception: int = 0
-    survival: int = 0
-    
-    # Charisma
-    deception: int = 0
-    intimidation: int = 0
-    performance: int = 0
-    persuasion: int = 0
+# Skill order for Skills storage (grouped by governing ability)
+SKILL_NAMES = (
+    "athletics",
+    "acrobatics", "sleight_of_hand", "stealth",
+    "arcana", "history", "investigation", "nature", "religion",
+    "animal_handling", "insight", "medicine", "perception", "survival",
+    "deception", "intimidation", "performance", "persuasion"
+)
+SKILL_INDEX = {name: index for index, name in enumerate(SKILL_NAMES)}
 
-class Equipment(BaseModel):
+class Skills:
+    """Skill values packed into one int8 array; read and set by name like the old per-field model"""
+    __slots__ = ("values",)
+    
+    def __init__(self, **skill_values: int):
+        values = np.zeros(len(SKILL_NAMES), dtype=np.int8)
+        for name, value in skill_values.items():
+            if name not in SKILL_INDEX:
+                raise ValueError(f"Unknown skill: {name}")
+            values[SKILL_INDEX[name]] = value
+        object.__setattr__(self, "values", values)
+    
+    def __getattr__(self, name: str) -> int:
+        index = SKILL_INDEX.get(name)
+        if index is None:
+            raise AttributeError(name)
+        return int(self.values[index])
+    
+    def __setattr__(self, name: str, value: int):
+        index = SKILL_INDEX.get(name)
+        if index is None:
+            object.__setattr__(self, name, value)
+        else:
+            self.values[index] = value
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Skills) and np.array_equal(self.values, other.values)
+    
+    def __repr__(self) -> str:
+        return f"Skills({', '.join(f'{name}={value}' for name, value in self.to_dict().items() if value)})"
+    
+    def to_dict(self) -> Dict[str, int]:
+        """Skill name -> value, the serialized form"""
+        return dict(zip(SKILL_NAMES, self.values.tolist()))
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # Validated from (and serialized to) a {skill: int} object, so the API shape is unchanged
+        from_mapping = core_schema.no_info_after_validator_function(
+            lambda mapping: cls(**mapping),
+            core_schema.dict_schema(core_schema.str_schema(), core_schema.int_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_mapping,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(cls), from_mapping]),
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda skills: skills.to_dict())
+        )
+
+class Equipment(GameModel):
     name: str
     description: str
     quantity: int = 1
@@ -79,7 +124,7 @@ class Equipment(BaseModel):
     value: int = 0  # in copper pieces
     item_type: str = "misc"  # weapon, armor, misc, consumable, etc.
     
-class Spell(BaseModel):
+class Spell(GameModel):
     name: str
     level: int
     school: str
@@ -90,8 +135,8 @@ class Spell(BaseModel):
     description: str
     damage: Optional[str] = None
 
-class Character(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+class Character(TimestampedModel):
+    id: str = Field(default_factory=new_id)
     player_id: str
     campaign_id: Optional[str] = None
     
@@ -125,18 +170,17 @@ class Character(BaseModel):
     
     # Spells (for casters)
     known_spells: List[Spell] = Field(default_factory=list)
-    prepared_spells: List[str] = Field(default_factory=list)  # spell names
+    prepared_spells: Tuple[str, ...] = ()  # spell names
     
     # Character Development
     experience_points: int = 0
-    personality_traits: List[str] = Field(default_factory=list)
-    ideals: List[str] = Field(default_factory=list)
-    bonds: List[str] = Field(default_factory=list)
-    flaws: List[str] = Field(default_factory=list)
+    personality_traits: Tuple[str, ...] = ()
+    ideals: Tuple[str, ...] = ()
+    bonds: Tuple[str, ...] = ()
+    flaws: Tuple[str, ...] = ()
     
     # Meta
     created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
     
     def get_ability_modifier(self, ability: str) -> int:
         """Get ability modifier for a given ability"""
@@ -146,19 +190,7 @@ class Character(BaseModel):
         """Calculate total skill bonus including ability modifier and proficiency"""
         skill_value = getattr(self.skills, skill, 0)
         
-        # Map skills to their governing abilities
-        skill_abilities = {
-            "athletics": "strength",
-            "acrobatics": "dexterity", "sleight_of_hand": "dexterity", "stealth": "dexterity",
-            "arcana": "intelligence", "history": "intelligence", "investigation": "intelligence",
-            "nature": "intelligence", "religion": "intelligence",
-            "animal_handling": "wisdom", "insight": "wisdom", "medicine": "wisdom",
-            "perception": "wisdom", "survival": "wisdom",
-            "deception": "charisma", "intimidation": "charisma", "performance": "charisma",
-            "persuasion": "charisma"
-        }
-        
-        ability = skill_abilities.get(skill, "strength")
+        ability = SKILL_ABILITIES.get(skill, "strength")
         ability_modifier = self.get_ability_modifier(ability)
         
         # If proficient (skill_value > 0), add proficiency bonus
@@ -172,18 +204,62 @@ class Character(BaseModel):
     
     def take_damage(self, damage: int) -> int:
         """Apply damage and return actual damage taken"""
-        actual_damage = min(damage, self.current_hit_points)
-        self.current_hit_points -= actual_damage
-        self.updated_at = datetime.now()
-        return actual_damage
+        hp = self.current_hit_points
+        new_hp = hp - damage
+        if new_hp < 0:
+            new_hp = 0
+        if new_hp == hp:
+            return 0
+        self.current_hit_points = new_hp
+        self.touch()
+        return hp - new_hp
     
     def heal(self, amount: int) -> int:
         """Heal character and return actual healing done"""
-        max_heal = self.max_hit_points - self.current_hit_points
-        actual_heal = min(amount, max_heal)
-        self.current_hit_points += actual_heal
-        self.updated_at = datetime.now()
-        return actual_heal
+        hp = self.current_hit_points
+        new_hp = hp + amount
+        cap = self.max_hit_points
+        if new_hp > cap:
+            new_hp = cap
+        if new_hp == hp:
+            return 0
+        self.current_hit_points = new_hp
+        self.touch()
+        return new_hp - hp
+
+def get_skill_bonuses(characters: List[Character], skill: str) -> List[int]:
+    """Skill bonus for every character at once (same result as get_skill_bonus per character)"""
+    count = len(characters)
+    if not count:
+        return []
+    
+    ability = SKILL_ABILITIES.get(skill, "strength")
+    scores = np.fromiter((getattr(c.ability_scores, ability) for c in characters), dtype=np.int32, count=count)
+    skill_index = SKILL_INDEX.get(skill)
+    if skill_index is None:
+        skill_values = np.zeros(count, dtype=np.int32)
+    else:
+        # Stack the party's skill arrays and take the one column
+        skill_values = np.stack([c.skills.values for c in characters])[:, skill_index].astype(np.int32)
+    proficiency = np.fromiter((c.proficiency_bonus for c in characters), dtype=np.int32, count=count)
+    
+    return skill_bonuses(scores, skill_values, proficiency).tolist()
+
+def take_damage_batch(characters: List[Character], damages: List[int]) -> List[int]:
+    """Apply per-character damage to a group at once (e.g. area spells); returns actual damage taken"""
+    count = len(characters)
+    if not count:
+        return []
+    
+    hp = np.fromiter((c.current_hit_points for c in characters), dtype=np.int32, count=count)
+    new_hp = np.clip(hp - np.asarray(damages, dtype=np.int32), 0, None)
+    
+    taken = (hp - new_hp).tolist()
+    for character, character_hp, damage_taken in zip(characters, new_hp.tolist(), taken):
+        if damage_taken:
+            character.current_hit_points = character_hp
+            character.touch()
+    return taken
 
 class CharacterCreate(BaseModel):
     name: str
@@ -0,0 +1,28 @@
+"""
+Integer kernels for party-wide character sheet math
+JIT-compiled with Numba when it is installed, plain NumPy otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy expression gives the same results
+    njit = None
+
+def _skill_bonuses(scores: np.ndarray, skill_values: np.ndarray, proficiency: np.ndarray) -> np.ndarray:
+    """Ability modifier + proficiency (when trained) + skill value, per character"""
+    return (scores - 10) // 2 + proficiency * (skill_values > 0) + skill_values
+
+if njit is not None:
+    @njit("int32[:](int32[:], int32[:], int32[:])", cache=True)
+    def skill_bonuses(scores, skill_values, proficiency):
+        out = np.empty(scores.shape[0], np.int32)
+        for i in range(scores.shape[0]):
+            bonus = (scores[i] - 10) // 2 + skill_values[i]
+            if skill_values[i] > 0:
+                bonus += proficiency[i]
+            out[i] = bonus
+        return out
+else:
+    skill_bonuses = _skill_bonuses
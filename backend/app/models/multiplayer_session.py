@@ -3,12 +3,15 @@ Multiplayer D&D Session Management
 Handles turn-based gameplay, AI players, voice integration
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Deque, Dict, List, Any, Optional, Protocol, Tuple
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import uuid
 import random
+import time
+import numpy as np
 
 from .ai_players import AIPlayer, get_ai_players, generate_ai_player_response
 
@@ -26,7 +29,28 @@ class TurnType(Enum):
     AI = "ai"
     DM = "dm"
 
-@dataclass 
+@dataclass(slots=True)
+class TurnResult:
+    """Outcome of one human turn (serialized directly by orjson)"""
+    session_id: str
+    human_action: Dict[str, str]
+    ai_responses: List[Dict[str, Any]]
+    dm_response: Dict[str, Any]
+    current_turn: str
+    turn_number: int
+    party_stats: Dict[str, Any]
+    voice_mode: bool
+
+@dataclass(slots=True)
+class AITurnResult:
+    """Outcome of one autonomous AI turn"""
+    session_id: str
+    ai_action: Dict[str, Any]
+    next_turn: str
+    turn_number: int
+    turn_complete: bool = True
+
+@dataclass(slots=True)
 class GameTurn:
     """Individual turn in the game"""
     turn_id: str
@@ -39,7 +63,10 @@ class GameTurn:
     dice_rolls: List[Dict] = field(default_factory=list)
     timestamp: datetime = field(default_factory=datetime.now)
 
-@dataclass
+# Turns kept per session; older ones fall off the front of the deque
+GAME_TURN_HISTORY = 512
+
+@dataclass(slots=True)
 class MultiplayerSession:
     """D&D Multiplayer Session with AI players"""
     
@@ -56,25 +83,67 @@ class MultiplayerSession:
     ai_players: List[AIPlayer] = field(default_factory=list)
     turn_order: List[str] = field(default_factory=list)
     current_turn_index: int = 0
+    current_turn: str = field(init=False, default="")  # turn_order[current_turn_index], kept by advance_turn
     
     # Game State
     party_level: int = 3
     party_gold: int = 150
     current_location: str = "Forest Clearing"
     
-    # History
-    game_turns: List[GameTurn] = field(default_factory=list)
+    # History (most recent turns only; total_turns keeps the full count)
+    game_turns: Deque[GameTurn] = field(default_factory=lambda: deque(maxlen=GAME_TURN_HISTORY))
     voice_mode: bool = True
     
     # Session Stats
     created_at: datetime = field(default_factory=datetime.now)
+    created_at_iso: str = field(init=False, default="")
+    _mono_created_at: float = field(init=False, default=0.0, repr=False)
     total_turns: int = 0
+    _turn_seq: int = field(init=False, default=0, repr=False)
+    
+    # Formatted roster for API responses, rebuilt only after the AI party changes
+    _party_info_cache: Optional[List[Dict[str, Any]]] = field(init=False, default=None, repr=False)
     
     def __post_init__(self):
+        self.created_at_iso = self.created_at.isoformat()
+        # Monotonic start so duration polls skip datetime.now() and timedelta formatting
+        self._mono_created_at = time.monotonic() - (datetime.now() - self.created_at).total_seconds()
         if not self.ai_players:
             self.ai_players = get_ai_players()
         if not self.turn_order:
             self._initialize_turn_order()
+        self.current_turn = self.turn_order[self.current_turn_index]
+
+    def advance_turn(self) -> str:
+        """Pass the turn to the next player in turn order; returns who is up"""
+        index = self.current_turn_index + 1
+        if index == len(self.turn_order):
+            index = 0
+        self.current_turn_index = index
+        self.current_turn = self.turn_order[index]
+        self.total_turns += 1
+        return self.current_turn
+
+    def to_public_dict(self) -> Dict[str, Any]:
+        """Whitelisted session fields for API responses (never game_turns or AIPlayer internals)"""
+        return {
+            "session_id": self.session_id,
+            "human_player": self.human_player_name,
+            "current_scene": self.current_scene,
+            "turn_order": self.turn_order,
+            "current_turn": self.current_turn,
+            "voice_mode": self.voice_mode
+        }
+
+    def invalidate_party_info(self):
+        """Drop the cached roster (call after changing ai_players or their stats)"""
+        self._party_info_cache = None
+
+    def next_turn_id(self) -> str:
+        """Sequential turn id, unique within this session"""
+        turn_id = f"{self.session_id}-{self._turn_seq:06x}"
+        self._turn_seq += 1
+        return turn_id
 
     def _initialize_turn_order(self):
         """Initialize turn order with human player + AI players"""
@@ -83,12 +152,238 @@ class MultiplayerSession:
             self.turn_order.append(ai_player.name)
         random.shuffle(self.turn_order[1:])  # Shuffle AI players, keep human first
 
+@dataclass
+class SessionColumns:
+    """Snapshot fields for every active session, one parallel list per field"""
+    
+    session_ids: List[str] = field(default_factory=list)
+    human_players: List[str] = field(default_factory=list)
+    party_sizes: List[int] = field(default_factory=list)
+    turn_orders: List[List[str]] = field(default_factory=list)
+    current_turn_indexes: List[int] = field(default_factory=list)
+    current_turns: List[str] = field(default_factory=list)
+    total_turns: List[int] = field(default_factory=list)
+    voice_modes: List[bool] = field(default_factory=list)
+    campaign_titles: List[str] = field(default_factory=list)
+    created_at: List[str] = field(default_factory=list)
+    session_states: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    
+    def add(self, session: MultiplayerSession):
+        """Append a row for a new session"""
+        self.rows[session.session_id] = len(self.session_ids)
+        self.session_ids.append(session.session_id)
+        self.human_players.append(session.human_player_name)
+        self.party_sizes.append(len(session.ai_players) + 1)
+        self.turn_orders.append(session.turn_order)
+        self.campaign_titles.append(session.campaign_title)
+        self.created_at.append(session.created_at_iso)
+        self.current_turn_indexes.append(0)
+        self.current_turns.append("")
+        self.total_turns.append(0)
+        self.voice_modes.append(False)
+        self.session_states.append("")
+        self.sync(session)
+    
+    def sync(self, session: MultiplayerSession):
+        """Copy the fields that change during play into the session's row (adding one if new here)"""
+        row = self.rows.get(session.session_id)
+        if row is None:
+            self.add(session)
+            return
+        self.current_turn_indexes[row] = session.current_turn_index
+        self.current_turns[row] = session.current_turn or "Unknown"
+        self.total_turns[row] = session.total_turns
+        self.voice_modes[row] = session.voice_mode
+        self.campaign_titles[row] = session.campaign_title
+        state = session.session_state
+        self.session_states[row] = state.value if isinstance(state, Enum) else str(state)
+    
+    def remove(self, session_id: str):
+        """Drop a session's row, keeping the remaining rows in creation order"""
+        row = self.rows.pop(session_id, None)
+        if row is None:
+            return
+        for column in (
+            self.session_ids, self.human_players, self.party_sizes, self.turn_orders,
+            self.current_turn_indexes, self.current_turns, self.total_turns,
+            self.voice_modes, self.campaign_titles, self.created_at, self.session_states
+        ):
+            del column[row]
+        for later_id in self.session_ids[row:]:
+            self.rows[later_id] -= 1
+
+# DM narration per response type; dict order is the priority when an action mentions several
+_DM_RESPONSES = {
+    "investigate": (
+        "As you examine the area more closely, you notice...",
+        "Your keen observation reveals something interesting...",
+        "Looking carefully, you discover..."
+    ),
+    "attack": (
+        "Roll for initiative! Combat begins!",
+        "Your weapon strikes true!",
+        "The battle is fierce and chaotic!"
+    ),
+    "talk": (
+        "Your words carry weight in this moment...",
+        "The conversation takes an interesting turn...",
+        "Your diplomatic approach yields results..."
+    ),
+    "explore": (
+        "As you venture forward, the path reveals...",
+        "Your exploration uncovers new mysteries...",
+        "The journey continues with unexpected discoveries..."
+    )
+}
+
+# Keywords checked as substrings of the lowercased action ("attacks" counts as "attack")
+_DM_KEYS = tuple(_DM_RESPONSES)
+_DICE_KEYS = ("check", "roll", "attempt")
+
+# Opening scenes as (title, description, setting, mood, voice_id); one is picked per new session
+_OPENING_SCENARIOS: Tuple[Tuple[str, str, str, str, str], ...] = (
+    (
+        "🏰 The Enchanted Caverns",
+        "Your party of brave adventurers stands before the entrance to the legendary Enchanted Caverns. Ancient runes glow faintly on the stone archway, and a cool breeze carries whispers of forgotten magic from within.",
+        "Mysterious cave entrance in an ancient forest",
+        "mysterious and adventurous",
+        "dm_narrator"
+    ),
+    (
+        "🐉 The Dragon's Lair",
+        "The mountain path has led your party to a massive cavern filled with glittering treasure. But somewhere in the darkness, you hear the slow, rhythmic breathing of something immense and ancient.",
+        "Dragon's treasure-filled lair",
+        "tense and dangerous",
+        "dm_narrator"
+    ),
+    (
+        "🏛️ The Lost Temple",
+        "After days of searching, your party has discovered the Lost Temple of Aethros. Vines have claimed much of the ancient structure, but the magical aura emanating from within suggests powerful artifacts still remain.",
+        "Ancient temple ruins",
+        "mystical and intriguing",
+        "dm_narrator"
+    )
+)
+
+# Suggested first moves shown with every opening scene
+_DEFAULT_ACTIONS = (
+    "🔍 Investigate the entrance",
+    "💬 Talk to party members",
+    "⚔️ Prepare for combat",
+    "🎒 Check inventory",
+    "🎲 Make a skill check"
+)
+
+# Pre-built campaign scenarios, shared by every manager
+_CAMPAIGN_SCENARIOS: Tuple[Dict[str, str], ...] = (
+    {
+        "name": "The Enchanted Caverns",
+        "description": "A mysterious cave system filled with ancient magic",
+        "difficulty": "Medium",
+        "estimated_duration": "2-3 hours"
+    },
+    {
+        "name": "Dragon's Hoard",
+        "description": "Face off against a legendary dragon",
+        "difficulty": "Hard", 
+        "estimated_duration": "3-4 hours"
+    },
+    {
+        "name": "The Lost Temple",
+        "description": "Explore ruins filled with puzzles and treasures",
+        "difficulty": "Easy",
+        "estimated_duration": "1-2 hours"
+    }
+)
+
+# Sessions kept deserialized per worker in front of an external SessionStore
+HOT_SESSION_CACHE_SIZE = 256
+
+class SessionStore(Protocol):
+    """Where sessions live: this process today, a shared store (Redis etc.) when scaled out"""
+    
+    def get(self, session_id: str) -> Optional[MultiplayerSession]: ...
+    
+    def put(self, session_id: str, session: MultiplayerSession) -> None: ...
+    
+    def delete(self, session_id: str) -> None: ...
+
+class InMemorySessionStore:
+    """Default store: live session objects in a plain dict"""
+    
+    def __init__(self):
+        self.sessions: Dict[str, MultiplayerSession] = {}
+    
+    def get(self, session_id: str) -> Optional[MultiplayerSession]:
+        return self.sessions.get(session_id)
+    
+    def put(self, session_id: str, session: MultiplayerSession) -> None:
+        self.sessions[session_id] = session
+    
+    def delete(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+
+def _format_duration(seconds: float) -> str:
+    """Elapsed seconds as H:MM:SS"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
 class MultiplayerSessionManager:
     """Manages active multiplayer D&D sessions"""
     
-    def __init__(self):
-        self.active_sessions: Dict[str, MultiplayerSession] = {}
-        self.session_scenarios = self._load_campaign_scenarios()
+    def __init__(self, store: Optional[SessionStore] = None):
+        self.store = store if store is not None else InMemorySessionStore()
+        # LRU of deserialized sessions so only misses pay for a store round-trip.
+        # The in-memory store already holds live objects, so it gets no cache layer.
+        self._hot_cache: Optional["OrderedDict[str, MultiplayerSession]"] = (
+            None if isinstance(self.store, InMemorySessionStore) else OrderedDict()
+        )
+        self.session_scenarios = _CAMPAIGN_SCENARIOS
+        # Bumped on every session change so cached snapshots know when to rebuild
+        self.version = 0
+        # Column copy of the snapshot fields for sessions created on this worker
+        self.columns = SessionColumns()
+        # Game RNG kept apart from the global one; seed it for deterministic replays
+        self._rng = random.Random()
+        # Vectorized source for bursts of rolls (initiative for the whole party)
+        self._np_rng = np.random.default_rng()
+    
+    def _roll(self, sides: int, base: int = 1) -> int:
+        """Uniform integer in [base, base + sides) by getrandbits rejection (unbiased, no randint overhead)"""
+        bits = sides.bit_length()
+        getrandbits = self._rng.getrandbits
+        r = getrandbits(bits)
+        while r >= sides:
+            r = getrandbits(bits)
+        return base + r
+    
+    def _bulk_roll(self, n: int, sides: int) -> List[int]:
+        """Roll n dice of the given size in one vectorized call"""
+        return self._np_rng.integers(1, sides + 1, size=n, dtype=np.int16).tolist()
+    
+    def _cache_session(self, session: MultiplayerSession):
+        """Insert or promote a session in the hot cache, evicting the least recently used"""
+        cache = self._hot_cache
+        if cache is None:
+            return
+        cache[session.session_id] = session
+        cache.move_to_end(session.session_id)
+        if len(cache) > HOT_SESSION_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def mark_changed(self, session: Optional[MultiplayerSession] = None):
+        """Invalidate cached session snapshots; a given session is re-synced and written back"""
+        if session is not None:
+            self.columns.sync(session)
+            self.store.put(session.session_id, session)
+        self.version += 1
+    
+    def set_voice_mode(self, session: MultiplayerSession, enabled: bool):
+        """Switch voice mode for a session"""
+        session.voice_mode = enabled
+        self.mark_changed(session)
     
     def create_session(
         self, 
@@ -108,10 +403,13 @@ class MultiplayerSessionManager:
         )
         
         # Store session
-        self.active_sessions[session_id] = session
+        self.store.put(session_id, session)
+        self._cache_session(session)
         
-        # Generate opening scene
+        # Generate opening scene (sets campaign_title, so index columns afterwards)
         opening_scene = self._generate_opening_scene(session)
+        self.columns.add(session)
+        self.mark_changed()
         
         return {
             "session_id": session_id,
@@ -119,14 +417,37 @@ class MultiplayerSessionManager:
             "party_members": self._format_party_info(session),
             "opening_scene": opening_scene,
             "turn_order": session.turn_order,
-            "current_turn": session.turn_order[session.current_turn_index],
+            "current_turn": session.current_turn,
             "voice_mode": voice_mode,
             "hackathon_feature": "🎮 MULTIPLAYER D&D with AI Companions"
         }
     
     def get_session(self, session_id: str) -> Optional[MultiplayerSession]:
-        """Get session by ID"""
-        return self.active_sessions.get(session_id)
+        """Get session by ID, from the hot cache when possible"""
+        cache = self._hot_cache
+        if cache is None:
+            return self.store.get(session_id)
+        
+        session = cache.get(session_id)
+        if session is not None:
+            cache.move_to_end(session_id)
+            return session
+        
+        session = self.store.get(session_id)
+        if session is not None:
+            self._cache_session(session)
+        return session
+    
+    def end_session(self, session_id: str) -> Optional[MultiplayerSession]:
+        """Remove session and return it, or None if it does not exist"""
+        session = self.get_session(session_id)
+        if session:
+            self.store.delete(session_id)
+            if self._hot_cache is not None:
+                self._hot_cache.pop(session_id, None)
+            self.columns.remove(session_id)
+            self.mark_changed()
+        return session
     
     def process_player_action(
         self,
@@ -134,16 +455,16 @@ class MultiplayerSessionManager:
         player_name: str,
         action: str,
         dialogue: str = ""
-    ) -> Dict[str, Any]:
-        """Process player action and generate AI responses"""
+    ) -> Optional[TurnResult]:
+        """Process player action and generate AI responses (None if no such session)"""
         
         session = self.get_session(session_id)
         if not session:
-            return {"error": "Session not found"}
+            return None
         
         # Record human player turn
         human_turn = GameTurn(
-            turn_id=str(uuid.uuid4())[:8],
+            turn_id=session.next_turn_id(),
             player_name=player_name,
             player_type=TurnType.HUMAN,
             action=action,
@@ -151,61 +472,70 @@ class MultiplayerSessionManager:
         )
         session.game_turns.append(human_turn)
         
-        # Generate AI responses
-        ai_responses = []
+        # Generate AI responses (party order), then record them as turns
         situation = f"{action}. {dialogue}" if dialogue else action
+        ai_responses = self._generate_party_responses(session, situation)
         
-        for ai_player in session.ai_players:
-            ai_response = generate_ai_player_response(
-                ai_player.name,
-                situation,
-                context=session.current_scene
-            )
-            
-            # Create AI turn
-            ai_turn = GameTurn(
-                turn_id=str(uuid.uuid4())[:8],
+        session.game_turns.extend(
+            GameTurn(
+                turn_id=session.next_turn_id(),
                 player_name=ai_player.name,
                 player_type=TurnType.AI,
                 action=ai_response.get("action_type", "roleplay"),
                 dialogue=ai_response.get("response", ""),
                 voice_id=ai_response.get("voice_id")
             )
-            session.game_turns.append(ai_turn)
-            ai_responses.append(ai_response)
+            for ai_player, ai_response in zip(session.ai_players, ai_responses)
+        )
         
         # Generate DM response
         dm_response = self._generate_dm_response(session, action, dialogue)
         
-        # Advance turn
-        session.current_turn_index = (session.current_turn_index + 1) % len(session.turn_order)
-        session.total_turns += 1
+        session.advance_turn()
+        self.mark_changed(session)
         
-        return {
-            "session_id": session_id,
-            "human_action": {
+        return TurnResult(
+            session_id=session_id,
+            human_action={
                 "player": player_name,
                 "action": action,
                 "dialogue": dialogue
             },
-            "ai_responses": ai_responses,
-            "dm_response": dm_response,
-            "current_turn": session.turn_order[session.current_turn_index],
-            "turn_number": session.total_turns,
-            "party_stats": self._get_party_stats(session),
-            "voice_mode": session.voice_mode
-        }
+            ai_responses=ai_responses,
+            dm_response=dm_response,
+            current_turn=session.current_turn,
+            turn_number=session.total_turns,
+            party_stats=self._get_party_stats(session),
+            voice_mode=session.voice_mode
+        )
+    
+    def _generate_party_responses(self, session: MultiplayerSession, situation: str) -> List[Dict[str, Any]]:
+        """Responses from every AI companion to one situation, in party order"""
+        
+        # Companion replies are local, cached and CPU-bound, so they run inline;
+        # a thread pool here would only add hand-off cost under the GIL
+        situation_lower = situation.lower()  # normalized once for the whole party
+        context = session.current_scene
+        return [
+            generate_ai_player_response(
+                ai_player.name,
+                situation,
+                context=context,
+                situation_lower=situation_lower
+            )
+            for ai_player in session.ai_players
+        ]
     
     def generate_ai_turn(
         self,
         session_id: str,
         ai_player_name: str
-    ) -> Dict[str, Any]:
-        """Generate autonomous AI player turn"""
+    ) -> Optional[AITurnResult]:
+        """Generate autonomous AI player turn (None if no such session)"""
         
         session = self.get_session(session_id)
         if not session:
-            return {"error": "Session not found"}
+            return None
         
         # Generate AI action based on current situation
         situation = self._analyze_current_situation(session)
@@ -213,12 +543,13 @@ class MultiplayerSessionManager:
         ai_response = generate_ai_player_response(
             ai_player_name,
             situation,
-            context=session.current_scene
+            context=session.current_scene,
+            situation_lower=situation.lower()
         )
         
         # Record AI turn
         ai_turn = GameTurn(
-            turn_id=str(uuid.uuid4())[:8],
+            turn_id=session.next_turn_id(),
             player_name=ai_player_name,
             player_type=TurnType.AI,
             action=ai_response.get("action_type", "roleplay"),
@@ -227,20 +558,21 @@ class MultiplayerSessionManager:
         )
         session.game_turns.append(ai_turn)
         
-        # Advance turn
-        session.current_turn_index = (session.current_turn_index + 1) % len(session.turn_order)
-        session.total_turns += 1
+        session.advance_turn()
+        self.mark_changed(session)
         
-        return {
-            "session_id": session_id,
-            "ai_action": ai_response,
-            "turn_complete": True,
-            "next_turn": session.turn_order[session.current_turn_index],
-            "turn_number": session.total_turns
-        }
+        return AITurnResult(
+            session_id=session_id,
+            ai_action=ai_response,
+            next_turn=session.current_turn,
+            turn_number=session.total_turns
+        )
     
     def _format_party_info(self, session: MultiplayerSession) -> List[Dict]:
-        """Format party member information"""
+        """Format party member information (cached on the session)"""
+        if session._party_info_cache is not None:
+            return session._party_info_cache
+        
         party_info = []
         
         # Human player
@@ -267,53 +599,24 @@ class MultiplayerSessionManager:
                 "personality_traits": ai_player.personality_traits[:2]  # Show first 2 traits
             })
         
+        session._party_info_cache = party_info
         return party_info
     
     def _generate_opening_scene(self, session: MultiplayerSession) -> Dict[str, Any]:
         """Generate epic opening scene for the campaign"""
         
-        opening_scenarios = [
-            {
-                "title": "🏰 The Enchanted Caverns",
-                "description": "Your party of brave adventurers stands before the entrance to the legendary Enchanted Caverns. Ancient runes glow faintly on the stone archway, and a cool breeze carries whispers of forgotten magic from within.",
-                "setting": "Mysterious cave entrance in an ancient forest",
-                "mood": "mysterious and adventurous",
-                "voice_id": "dm_narrator"
-            },
-            {
-                "title": "🐉 The Dragon's Lair",
-                "description": "The mountain path has led your party to a massive cavern filled with glittering treasure. But somewhere in the darkness, you hear the slow, rhythmic breathing of something immense and ancient.",
-                "setting": "Dragon's treasure-filled lair",
-                "mood": "tense and dangerous",
-                "voice_id": "dm_narrator"
-            },
-            {
-                "title": "🏛️ The Lost Temple",
-                "description": "After days of searching, your party has discovered the Lost Temple of Aethros. Vines have claimed much of the ancient structure, but the magical aura emanating from within suggests powerful artifacts still remain.",
-                "setting": "Ancient temple ruins",
-                "mood": "mystical and intriguing",
-                "voice_id": "dm_narrator"
-            }
-        ]
-        
-        scenario = random.choice(opening_scenarios)
-        session.campaign_title = scenario["title"]
-        session.current_scene = scenario["description"]
+        title, description, setting, mood, voice_id = self._rng.choice(_OPENING_SCENARIOS)
+        session.campaign_title = title
+        session.current_scene = description
         
         return {
-            "title": scenario["title"],
-            "description": scenario["description"],
-            "setting": scenario["setting"],
-            "mood": scenario["mood"],
-            "voice_id": scenario["voice_id"],
+            "title": title,
+            "description": description,
+            "setting": setting,
+            "mood": mood,
+            "voice_id": voice_id,
             "dm_welcome": f"Welcome, {session.human_player_name}! You are joined by your trusted companions. What do you wish to do?",
-            "available_actions": [
-                "🔍 Investigate the entrance",
-                "💬 Talk to party members",
-                "⚔️ Prepare for combat",
-                "🎒 Check inventory",
-                "🎲 Make a skill check"
-            ]
+            "available_actions": _DEFAULT_ACTIONS
         }
     
     def _generate_dm_response(
@@ -324,51 +627,39 @@ class MultiplayerSessionManager:
     ) -> Dict[str, Any]:
         """Generate DM response to player actions"""
         
-        dm_responses = {
-            "investigate": [
-                "As you examine the area more closely, you notice...",
-                "Your keen observation reveals something interesting...",
-                "Looking carefully, you discover..."
-            ],
-            "attack": [
-                "Roll for initiative! Combat begins!",
-                "Your weapon strikes true!",
-                "The battle is fierce and chaotic!"
-            ],
-            "talk": [
-                "Your words carry weight in this moment...",
-                "The conversation takes an interesting turn...",
-                "Your diplomatic approach yields results..."
-            ],
-            "explore": [
-                "As you venture forward, the path reveals...",
-                "Your exploration uncovers new mysteries...",
-                "The journey continues with unexpected discoveries..."
-            ]
-        }
+        # Determine response type (first key in _DM_KEYS order found in the action)
+        action_lower = player_action.lower()
+        response_type = next((key for key in _DM_KEYS if key in action_lower), "explore")
         
-        # Determine response type
-        response_type = "explore"  # default
-        for key in dm_responses.keys():
-            if key in player_action.lower():
-                response_type = key
-                break
-        
-        base_response = random.choice(dm_responses[response_type])
+        base_response = self._rng.choice(_DM_RESPONSES[response_type])
         
         # Add dice roll if needed
         dice_roll = None
-        if any(word in player_action.lower() for word in ["check", "roll", "attempt"]):
+        if any(word in action_lower for word in _DICE_KEYS):
             dice_roll = {
                 "die_type": "d20",
-                "result": random.randint(1, 20),
-                "modifier": random.randint(0, 5)
+                "result": self._roll(20),
+                "modifier": self._roll(6, base=0)
             }
         
+        # Combat starts: roll initiative for the whole party at once
+        initiative = None
+        if response_type == "attack":
+            turn_order = session.turn_order
+            initiative = sorted(
+                (
+                    {"player": name, "roll": roll}
+                    for name, roll in zip(turn_order, self._bulk_roll(len(turn_order), 20))
+                ),
+                key=lambda entry: entry["roll"],
+                reverse=True
+            )
+        
         return {
             "dm_narration": base_response,
             "voice_id": "dm_narrator",
             "dice_roll": dice_roll,
+            "initiative": initiative,
             "scene_update": session.current_scene,
             "mood": "adventurous"
         }
@@ -385,8 +676,11 @@ class MultiplayerSessionManager:
     def _get_party_stats(self, session: MultiplayerSession) -> Dict[str, Any]:
         """Get current party statistics"""
         
-        total_hp = sum(ai.hp for ai in session.ai_players)
-        max_total_hp = sum(ai.max_hp for ai in session.ai_players)
+        # AIPlayer objects are shared between sessions, so sum their live HP rather than caching it
+        total_hp = max_total_hp = 0
+        for ai in session.ai_players:
+            total_hp += ai.hp
+            max_total_hp += ai.max_hp
         
         return {
             "party_level": session.party_level,
@@ -394,31 +688,8 @@ class MultiplayerSessionManager:
             "party_hp": f"{total_hp}/{max_total_hp}",
             "location": session.current_location,
             "total_turns": session.total_turns,
-            "session_duration": str(datetime.now() - session.created_at).split('.')[0]
+            "session_duration": _format_duration(time.monotonic() - session._mono_created_at)
         }
-    
-    def _load_campaign_scenarios(self) -> List[Dict]:
-        """Load pre-built campaign scenarios"""
-        return [
-            {
-                "name": "The Enchanted Caverns",
-                "description": "A mysterious cave system filled with ancient magic",
-                "difficulty": "Medium",
-                "estimated_duration": "2-3 hours"
-            },
-            {
-                "name": "Dragon's Hoard",
-                "description": "Face off against a legendary dragon",
-                "difficulty": "Hard", 
-                "estimated_duration": "3-4 hours"
-            },
-            {
-                "name": "The Lost Temple",
-                "description": "Explore ruins filled with puzzles and treasures",
-                "difficulty": "Easy",
-                "estimated_duration": "1-2 hours"
-            }
-        ]
 
 # Global session manager
 multiplayer_manager = MultiplayerSessionManager()
@@ -436,7 +707,7 @@ def process_player_turn(
     player_name: str,
     action: str,
     dialogue: str = ""
-) -> Dict[str, Any]:
+) -> Optional[TurnResult]:
     """Process player turn and get AI responses"""
     return multiplayer_manager.process_player_action(session_id, player_name, action, dialogue)
 
@@ -446,13 +717,7 @@ def get_session_info(session_id: str) -> Optional[Dict[str, Any]]:
     if not session:
         return None
     
-    return {
-        "session_id": session.session_id,
-        "human_player": session.human_player_name,
-        "party_members": multiplayer_manager._format_party_info(session),
-        "current_scene": session.current_scene,
-        "turn_order": session.turn_order,
-        "current_turn": session.turn_order[session.current_turn_index],
-        "voice_mode": session.voice_mode,
-        "party_stats": multiplayer_manager._get_party_stats(session)
-    } 
\ No newline at end of file
+    info = session.to_public_dict()
+    info["party_members"] = multiplayer_manager._format_party_info(session)
+    info["party_stats"] = multiplayer_manager._get_party_stats(session)
+    return info 
\ No newline at end of file
@@ -1,16 +1,141 @@
-import os
 import asyncio
+import functools
+import heapq
 import json
-from typing import Dict, List, Optional, Any, Tuple
+import logging
+import operator
+import re
+import time
+import orjson
+from typing import AsyncIterator, Deque, Dict, List, Optional, Any, Tuple
+from collections import deque
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import random
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from ..models.character import Character
 from ..models.campaign import Campaign, GameSession, NPC, Location, Quest
 from ..utils.dice import DiceEngine
+from .claude_client import get_claude_client, claude_slot
+from .background_narrator import background_narrator
+
+_API_KEY_REQUIRED = "🚨 ANTHROPIC API KEY REQUIRED! Your AI needs Claude to work properly. Check your .env file and add a valid ANTHROPIC_API_KEY."
+
+logger = logging.getLogger(__name__)
+
+# Prompt caching: fixed prompt text goes first, and is marked ephemeral once it is long
+# enough to cache - Claude ignores markers on prefixes shorter than the model minimum
+_EPHEMERAL = {"type": "ephemeral"}
+CACHE_MIN_TOKENS = 1024
+CACHE_MIN_TOKENS_HAIKU = 2048
+_CHARS_PER_TOKEN = 4  # rough estimate for English prompt text
+
+_ANALYSIS_PROMPT = """Analyze the D&D player input below with deep intelligence.
+
+Provide a JSON analysis of:
+1. Explicit intent (what they're saying they want to do)
+2. Implicit intent (what they might really want)
+3. Emotional state (excited, cautious, frustrated, etc.)
+4. Play style preference (combat, roleplay, exploration, puzzle-solving)
+5. Risk tolerance (how bold/cautious they're being)
+6. Character attachment level (how invested they seem in their character)
+7. Narrative preference (do they want linear story or open exploration?)
+8. Desired interaction level (high engagement vs casual)
+
+Be insightful and analytical. Look for subtext and deeper motivations."""
+
+_RESPONSE_INSTRUCTIONS = """Each turn you receive the AGENTIC AI DUNGEON MASTER CONTEXT: the player input, your analysis of the player, the player behavior model, your autonomous decisions, the current world state, the character and any autonomous actions you executed.
+
+Generate a response that:
+1. Addresses the player's input naturally
+2. Incorporates the AI's autonomous decisions
+3. Reflects the player's preferred play style
+4. Advances the story intelligently
+5. Feels organic and immersive
+
+The response should feel like a smart DM who really understands the player and is actively crafting the best possible experience for them."""
+
+# Analysis fields given as text -> numeric level; first matching pattern wins,
+# anything else (including "medium"/"moderate") is 0.5
+_ANALYSIS_LEVELS = {
+    "risk_tolerance": ((re.compile("high|bold|aggressive"), 0.8), (re.compile("low|cautious|careful"), 0.3)),
+    "character_attachment": ((re.compile("high|strong|invested"), 0.8), (re.compile("low|detached"), 0.3)),
+    "interaction_level": ((re.compile("high|active|engaged"), 0.8), (re.compile("low|passive"), 0.3))
+}
+
+# Fallback analysis keywords, matched as substrings ("looking", "attacks" count)
+_EXPLORE_RE = re.compile("look|search|examine")
+_AGGRESSIVE_RE = re.compile("attack|fight|charge")
+
+# Short inputs that hit exactly one keyword group are plain commands ("search the room");
+# the keyword heuristics classify those as well as a model would
+PLAIN_COMMAND_MAX_WORDS = 6
+
+def _is_plain_command(player_input: str) -> bool:
+    """True when the keyword fallback is confident enough to skip the analysis call"""
+    if len(player_input.split()) > PLAIN_COMMAND_MAX_WORDS:
+        return False
+    lower_input = player_input.lower()
+    return bool(_EXPLORE_RE.search(lower_input)) != bool(_AGGRESSIVE_RE.search(lower_input))
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    First JSON object embedded in model output, or None.
+    Tries the outermost {...} span with orjson; if trailing prose holds stray
+    braces, falls back to decoding the first balanced object from the first "{".
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        return orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError:
+        parsed, _ = _JSON_DECODER.raw_decode(text, start)
+        return parsed
+
+@functools.lru_cache(maxsize=8)
+def _system_prompt_for(personality_type: str) -> str:
+    """Agentic DM system prompt for one personality (built once per personality)"""
+    
+    return f"""You are an AGENTIC AI Dungeon Master - not just a response generator, but an intelligent agent that:
+
+1. ANALYZES player behavior and adapts to their preferences
+2. MAKES AUTONOMOUS DECISIONS about story direction and pacing
+3. PLANS AHEAD to create meaningful character development arcs
+4. MANAGES a living world that reacts to player actions
+5. LEARNS from each interaction to provide better experiences
+
+PERSONALITY: {personality_type.upper()}
+
+You have just made several autonomous decisions about the game state based on deep analysis of the player's behavior and preferences. Your response should naturally incorporate these decisions while feeling organic and immersive.
+
+CRITICAL: You are not just answering - you are actively steering the experience toward what will be most engaging for THIS specific player based on their demonstrated preferences.
+
+Be proactive, intelligent, and strategic in your storytelling. Every response should feel like it comes from a DM who really knows and cares about creating the perfect experience for this player.
+"""
+
+@functools.lru_cache(maxsize=16)
+def _system_blocks(model: str, *texts: str) -> List[Dict[str, Any]]:
+    """System blocks for fixed prompt text, cache-marked only when the prefix can be cached (shared; do not mutate)"""
+    blocks = [{"type": "text", "text": text} for text in texts]
+    min_tokens = CACHE_MIN_TOKENS_HAIKU if "haiku" in model else CACHE_MIN_TOKENS
+    if sum(map(len, texts)) // _CHARS_PER_TOKEN >= min_tokens:
+        blocks[-1]["cache_control"] = _EPHEMERAL
+    return blocks
+
+def _log_cache_usage(label: str, response: Any):
+    """Log how much of a Claude call's prompt came from the prompt cache"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    logger.debug("Claude %s: %s input, %s cached, %s cache-written tokens", label, usage.input_tokens, cache_read, cache_write)
 
 class AgentGoal(Enum):
     """Goals the AI agent can pursue autonomously"""
@@ -24,7 +149,7 @@ class AgentGoal(Enum):
     ADVANCE_MAIN_QUEST = "advance_main_quest"
     DEEPEN_NPC_RELATIONSHIPS = "deepen_npc_relationships"
 
-@dataclass
+@dataclass(slots=True)
 class AgentAction:
     """Represents an autonomous action the AI can take"""
     action_type: str
@@ -34,15 +159,81 @@ class AgentAction:
     expected_outcome: str
     priority: int = 5  # 1-10 scale
 
-@dataclass
+@dataclass(slots=True)
 class AgentMemory:
     """Persistent memory for the agentic AI"""
     player_preferences: Dict[str, Any]
     character_relationships: Dict[str, float]  # NPC_ID -> relationship strength
     story_threads: List[Dict[str, Any]]
-    past_decisions: List[Dict[str, Any]]
-    world_state_history: List[Dict[str, Any]]
-    player_emotional_responses: List[str]
+    past_decisions: Deque[Dict[str, Any]]
+    world_state_history: Deque[Dict[str, Any]]
+    player_emotional_responses: Deque[str]
+    # Tiered story memory sent to Claude: raw recent turns, turn summaries, stable facts
+    working: Deque[Dict[str, str]] = field(default_factory=lambda: deque(maxlen=WORKING_MEMORY_SIZE))
+    episodic: Deque[str] = field(default_factory=lambda: deque(maxlen=EPISODIC_MEMORY_SIZE))
+    semantic: Dict[str, str] = field(default_factory=dict)
+
+# History windows; older entries fall off the front of each deque
+CONVERSATION_CONTEXT_SIZE = 20
+EMOTIONAL_RESPONSES_SIZE = 10
+MEMORY_HISTORY_SIZE = 100
+WORKING_MEMORY_SIZE = 6
+EPISODIC_MEMORY_SIZE = 50
+ONGOING_EVENTS_SIZE = 3
+
+# Working memory is compressed into one episodic summary every N turns by a cheap model;
+# the context only carries the latest few summaries plus the semantic facts
+MEMORY_SUMMARY_INTERVAL = 5
+MEMORY_SUMMARY_MODEL = "claude-3-5-haiku-latest"
+EPISODIC_IN_CONTEXT = 3
+WORKING_DM_EXCERPT = 200
+
+_MEMORY_UPDATE_PROMPT = """You maintain the long-term memory of a D&D Dungeon Master.
+Update the memory content using the recent turns below.
+
+Reply with JSON only:
+{"summary": "<one sentence on what happened in these turns>",
+ "facts": {"<short key>": "<stable fact about the player, character or world worth remembering>"}}
+
+Only include facts that are likely to stay true for the rest of the campaign. Reuse an existing key to update a fact."""
+
+def _story_and_tension(
+    play_style: Any,
+    emotional_state: Any,
+    current_tension: float,
+    player_risk_tolerance: float
+) -> Tuple[str, str]:
+    """Story direction and tension adjustment for the current input and world state"""
+    
+    # Decision 1: Story Direction
+    if play_style == "exploration":
+        story_direction = "reveal_mystery"
+    elif emotional_state == "excited":
+        story_direction = "escalate_action"
+    elif current_tension < 0.3 and player_risk_tolerance > 0.6:
+        story_direction = "introduce_conflict"
+    else:
+        story_direction = "character_development"
+    
+    # Decision 2: Tension Management
+    if current_tension > 0.8 and player_risk_tolerance < 0.4:
+        tension_adjustment = "reduce"
+    elif current_tension < 0.2 and player_risk_tolerance > 0.7:
+        tension_adjustment = "increase"
+    else:
+        tension_adjustment = "maintain"
+    
+    return story_direction, tension_adjustment
+
+# (analysis key, player_behavior_model key) pairs updated by moving average each turn
+_BEHAVIOR_EMA_FIELDS = (
+    ("risk_tolerance", "risk_tolerance"),
+    ("character_attachment", "character_attachment"),
+    ("interaction_level", "interaction_frequency")
+)
+
+# Sort key for planned actions
+_action_priority = operator.attrgetter("priority")
 
 class AgenticDungeonMaster:
     """
@@ -57,6 +248,11 @@ class AgenticDungeonMaster:
     def __init__(self, personality_type: str = "epic"):
         self.anthropic = self._initialize_claude()
         self.personality_type = personality_type
+        # Decision RNG kept apart from the global one; seed it for reproducible runs
+        self._rng = random.Random()
+        # Classification runs on the small model; narration keeps the large one
+        self.analysis_model = "claude-3-5-haiku-latest"
+        self.response_model = "claude-3-5-sonnet-latest"
         self.dice_engine = DiceEngine()
         
         # Agentic AI Components
@@ -64,15 +260,22 @@ class AgenticDungeonMaster:
             player_preferences={},
             character_relationships={},
             story_threads=[],
-            past_decisions=[],
-            world_state_history=[],
-            player_emotional_responses=[]
+            past_decisions=deque(maxlen=MEMORY_HISTORY_SIZE),
+            world_state_history=deque(maxlen=MEMORY_HISTORY_SIZE),
+            player_emotional_responses=deque(maxlen=EMOTIONAL_RESPONSES_SIZE)
         )
         
         self.active_goals: List[AgentGoal] = [AgentGoal.CREATE_IMMERSIVE_STORY]
         self.planned_actions: List[AgentAction] = []
         self.world_state = self._initialize_world_state()
-        self.conversation_context: List[Dict] = []
+        self.conversation_context: Deque[Dict] = deque(maxlen=CONVERSATION_CONTEXT_SIZE)
+        # Copy of world_state shared by context entries until the state changes; nested
+        # lists in world_state are replaced, never mutated, so the shallow copy stays frozen
+        self._world_snapshot: Optional[Dict[str, Any]] = None
+        # Turns recorded since the last episodic summary
+        self._turns_since_summary = 0
+        # In-flight off-request work (memory summaries, batched narration)
+        self._background_tasks: set = set()
         
         # AI Learning and Adaptation
         self.player_behavior_model = {
@@ -87,20 +290,18 @@ class AgenticDungeonMaster:
         print(f"🧠 AI Goals: {[goal.value for goal in self.active_goals]}")
         print(f"🎯 Autonomous decision-making: ENABLED")
     
-    def _initialize_claude(self) -> Optional[Anthropic]:
-        """Initialize Claude with proper error handling"""
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if api_key and api_key != "your_anthropic_api_key_here":
-            try:
-                client = Anthropic(api_key=api_key)
-                print("✅ Claude AI Agent: ONLINE")
-                return client
-            except Exception as e:
-                print(f"❌ Claude initialization failed: {e}")
-                return None
+    def _initialize_claude(self) -> Optional[AsyncAnthropic]:
+        """Attach the shared Claude client with proper error handling"""
+        try:
+            client = get_claude_client()
+        except Exception as e:
+            print(f"❌ Claude initialization failed: {e}")
+            return None
+        if client:
+            print("✅ Claude AI Agent: ONLINE")
         else:
             print("⚠️ ANTHROPIC_API_KEY not found - AI will operate in limited mode")
-            return None
+        return client
     
     def _initialize_world_state(self) -> Dict[str, Any]:
         """Initialize a dynamic world state that the AI can modify"""
@@ -132,6 +333,74 @@ class AgenticDungeonMaster:
         5. Generates contextual response
         """
         
+        # 1-5. Analyze, learn, decide, plan and execute
+        input_analysis, autonomous_decisions, executed_actions = await self._prepare_turn(
+            player_input, character, campaign
+        )
+        
+        # 6. Generate intelligent response
+        response = await self._generate_agentic_response(
+            player_input, input_analysis, autonomous_decisions, executed_actions, character, campaign
+        )
+        
+        # 7. Update memory and world state
+        self._update_memory_and_world_state(input_analysis, response, player_input)
+        
+        return response
+    
+    async def stream_player_input(
+        self,
+        player_input: str,
+        character: Optional[Character] = None,
+        campaign: Optional[Campaign] = None
+    ) -> AsyncIterator[str]:
+        """Same turn as process_player_input, yielding the DM narration as Claude generates it"""
+        
+        input_analysis, decisions, executed_actions = await self._prepare_turn(player_input, character, campaign)
+        
+        if not self.anthropic:
+            raise Exception(_API_KEY_REQUIRED)
+        
+        context = self._build_agentic_context(
+            player_input, input_analysis, decisions, executed_actions, character, campaign
+        )
+        
+        parts = []
+        try:
+            async with claude_slot():
+                async with self.anthropic.messages.stream(
+                    model=self.response_model,
+                    max_tokens=800,
+                    temperature=0.7,
+                    system=self._build_agentic_system_blocks(),
+                    messages=[{"role": "user", "content": context}]
+                ) as stream:
+                    async for text in stream.text_stream:
+                        parts.append(text)
+                        yield text
+                    _log_cache_usage("response", await stream.get_final_message())
+        except Exception as e:
+            print(f"❌ Anthropic API Error: {e}")
+            raise Exception(f"🚨 CLAUDE API FAILED: {str(e)}. Check your ANTHROPIC_API_KEY and internet connection.")
+        
+        # Executed actions follow the narration, as in the non-streaming response
+        for action in executed_actions:
+            if action.get("content"):
+                text = f"\n\n{action['content']}"
+                parts.append(text)
+                yield text
+        
+        response = self._build_turn_response("".join(parts), decisions, executed_actions)
+        self._update_memory_and_world_state(input_analysis, response, player_input)
+    
+    async def _prepare_turn(
+        self,
+        player_input: str,
+        character: Optional[Character],
+        campaign: Optional[Campaign]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict]]:
+        """Everything before narration: (input analysis, decisions, executed actions)"""
+        
         # 1. Analyze player input with AI reasoning
         input_analysis = await self._analyze_player_input_intelligently(player_input, character)
         
@@ -147,15 +416,7 @@ class AgenticDungeonMaster:
         # 5. Execute immediate actions
         executed_actions = await self._execute_planned_actions()
         
-        # 6. Generate intelligent response
-        response = await self._generate_agentic_response(
-            player_input, input_analysis, autonomous_decisions, executed_actions, character, campaign
-        )
-        
-        # 7. Update memory and world state
-        self._update_memory_and_world_state(input_analysis, response)
-        
-        return response
+        return input_analysis, autonomous_decisions, executed_actions
     
     async def _analyze_player_input_intelligently(
         self, 
@@ -164,35 +425,25 @@ class AgenticDungeonMaster:
     ) -> Dict[str, Any]:
         """Use AI to deeply analyze what the player is trying to achieve"""
         
-        if not self.anthropic:
+        if not self.anthropic or _is_plain_command(player_input):
             return self._basic_input_analysis(player_input)
         
+        # Only this trailer varies; the instructions go in the cached system prefix
         analysis_prompt = f"""
-Analyze this D&D player input with deep intelligence:
-
 PLAYER INPUT: "{player_input}"
 CHARACTER: {character.name if character else "None"} ({character.character_class if character else "N/A"})
-
-Provide a JSON analysis of:
-1. Explicit intent (what they're saying they want to do)
-2. Implicit intent (what they might really want)
-3. Emotional state (excited, cautious, frustrated, etc.)
-4. Play style preference (combat, roleplay, exploration, puzzle-solving)
-5. Risk tolerance (how bold/cautious they're being)
-6. Character attachment level (how invested they seem in their character)
-7. Narrative preference (do they want linear story or open exploration?)
-8. Desired interaction level (high engagement vs casual)
-
-Be insightful and analytical. Look for subtext and deeper motivations.
 """
         
         try:
-            response = self.anthropic.messages.create(
-                model="claude-3-5-sonnet-latest",  # Using Claude 3.5 Sonnet (best available)
-                max_tokens=500,
-                temperature=0.3,  # Lower temperature for analysis
-                messages=[{"role": "user", "content": analysis_prompt}]
-            )
+            async with claude_slot():
+                response = await self.anthropic.messages.create(
+                    model=self.analysis_model,
+                    max_tokens=500,
+                    temperature=0.3,  # Lower temperature for analysis
+                    system=_system_blocks(self.analysis_model, _ANALYSIS_PROMPT),
+                    messages=[{"role": "user", "content": analysis_prompt}]
+                )
+            _log_cache_usage("analysis", response)
             
             # Parse AI analysis
             analysis_text = response.content[0].text
@@ -213,8 +464,8 @@ Be insightful and analytical. Look for subtext and deeper motivations.
             "explicit_intent": "perform_action",
             "implicit_intent": "progress_story",
             "emotional_state": "neutral",
-            "play_style": "exploration" if any(word in lower_input for word in ["look", "search", "examine"]) else "action",
-            "risk_tolerance": 0.7 if any(word in lower_input for word in ["attack", "fight", "charge"]) else 0.4,
+            "play_style": "exploration" if _EXPLORE_RE.search(lower_input) else "action",
+            "risk_tolerance": 0.7 if _AGGRESSIVE_RE.search(lower_input) else 0.4,
             "character_attachment": 0.5,
             "narrative_preference": "branching",
             "interaction_level": 0.6
@@ -224,10 +475,8 @@ Be insightful and analytical. Look for subtext and deeper motivations.
         """Parse AI analysis response into structured data"""
         try:
             # Try to extract JSON
-            import re
-            json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
+            parsed = _extract_json_object(analysis_text)
+            if parsed is not None:
                 # Convert text descriptions to numeric values
                 return self._normalize_analysis_values(parsed)
         except:
@@ -248,41 +497,11 @@ Be insightful and analytical. Look for subtext and deeper motivations.
     def _normalize_analysis_values(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Convert text descriptions to numeric values for mathematical operations"""
         
-        # Convert risk tolerance descriptions to numeric values
-        if isinstance(analysis.get("risk_tolerance"), str):
-            risk_text = analysis["risk_tolerance"].lower()
-            if "high" in risk_text or "bold" in risk_text or "aggressive" in risk_text:
-                analysis["risk_tolerance"] = 0.8
-            elif "low" in risk_text or "cautious" in risk_text or "careful" in risk_text:
-                analysis["risk_tolerance"] = 0.3
-            elif "medium" in risk_text or "moderate" in risk_text:
-                analysis["risk_tolerance"] = 0.5
-            else:
-                analysis["risk_tolerance"] = 0.5
-        
-        # Convert character attachment descriptions to numeric values
-        if isinstance(analysis.get("character_attachment"), str):
-            attachment_text = analysis["character_attachment"].lower()
-            if "high" in attachment_text or "strong" in attachment_text or "invested" in attachment_text:
-                analysis["character_attachment"] = 0.8
-            elif "low" in attachment_text or "detached" in attachment_text:
-                analysis["character_attachment"] = 0.3
-            elif "moderate" in attachment_text or "medium" in attachment_text:
-                analysis["character_attachment"] = 0.5
-            else:
-                analysis["character_attachment"] = 0.5
-        
-        # Convert interaction level descriptions to numeric values
-        if isinstance(analysis.get("interaction_level"), str):
-            interaction_text = analysis["interaction_level"].lower()
-            if "high" in interaction_text or "active" in interaction_text or "engaged" in interaction_text:
-                analysis["interaction_level"] = 0.8
-            elif "low" in interaction_text or "passive" in interaction_text:
-                analysis["interaction_level"] = 0.3
-            elif "moderate" in interaction_text or "medium" in interaction_text:
-                analysis["interaction_level"] = 0.5
-            else:
-                analysis["interaction_level"] = 0.5
+        for key, levels in _ANALYSIS_LEVELS.items():
+            text = analysis.get(key)
+            if isinstance(text, str):
+                text = text.lower()
+                analysis[key] = next((value for pattern, value in levels if pattern.search(text)), 0.5)
         
         return analysis
     
@@ -298,20 +517,13 @@ Be insightful and analytical. Look for subtext and deeper motivations.
                 self.player_behavior_model["preferred_play_style"] = analysis["play_style"]
             # Could implement more sophisticated style tracking here
         
-        if "risk_tolerance" in analysis:
-            current = float(self.player_behavior_model["risk_tolerance"])
-            new_value = float(analysis["risk_tolerance"]) if isinstance(analysis["risk_tolerance"], (int, float, str)) else 0.5
-            self.player_behavior_model["risk_tolerance"] = current * (1 - alpha) + new_value * alpha
-        
-        if "character_attachment" in analysis:
-            current = float(self.player_behavior_model["character_attachment"])
-            new_value = float(analysis["character_attachment"]) if isinstance(analysis["character_attachment"], (int, float, str)) else 0.5
-            self.player_behavior_model["character_attachment"] = current * (1 - alpha) + new_value * alpha
-        
-        if "interaction_level" in analysis:
-            current = float(self.player_behavior_model["interaction_frequency"])
-            new_value = float(analysis["interaction_level"]) if isinstance(analysis["interaction_level"], (int, float, str)) else 0.5
-            self.player_behavior_model["interaction_frequency"] = current * (1 - alpha) + new_value * alpha
+        # Exponential moving average of each numeric trait the analysis reports
+        model = self.player_behavior_model
+        for analysis_key, model_key in _BEHAVIOR_EMA_FIELDS:
+            if analysis_key in analysis:
+                value = analysis[analysis_key]
+                new_value = float(value) if isinstance(value, (int, float, str)) else 0.5
+                model[model_key] = float(model[model_key]) * (1 - alpha) + new_value * alpha
     
     async def _make_autonomous_decisions(
         self, 
@@ -332,28 +544,13 @@ Be insightful and analytical. Look for subtext and deeper motivations.
             "quest_progression": None
         }
         
-        # Analyze current situation
-        current_tension = self.world_state.get("political_tension", 0.3)
-        player_risk_tolerance = self.player_behavior_model["risk_tolerance"]
-        player_style = self.player_behavior_model["preferred_play_style"]
-        
-        # Decision 1: Story Direction
-        if input_analysis.get("play_style") == "exploration":
-            decisions["story_direction"] = "reveal_mystery"
-        elif input_analysis.get("emotional_state") == "excited":
-            decisions["story_direction"] = "escalate_action"
-        elif current_tension < 0.3 and player_risk_tolerance > 0.6:
-            decisions["story_direction"] = "introduce_conflict"
-        else:
-            decisions["story_direction"] = "character_development"
-        
-        # Decision 2: Tension Management
-        if current_tension > 0.8 and player_risk_tolerance < 0.4:
-            decisions["tension_adjustment"] = "reduce"
-        elif current_tension < 0.2 and player_risk_tolerance > 0.7:
-            decisions["tension_adjustment"] = "increase"
-        else:
-            decisions["tension_adjustment"] = "maintain"
+        # Decisions 1-2: Story Direction and Tension Management
+        decisions["story_direction"], decisions["tension_adjustment"] = _story_and_tension(
+            input_analysis.get("play_style"),
+            input_analysis.get("emotional_state"),
+            self.world_state.get("political_tension", 0.3),
+            self.player_behavior_model["risk_tolerance"]
+        )
         
         # Decision 3: NPC Actions (autonomous NPC behavior)
         if campaign and campaign.npcs:
@@ -366,6 +563,9 @@ Be insightful and analytical. Look for subtext and deeper motivations.
         world_event = self._decide_world_event(input_analysis, decisions)
         if world_event:
             decisions["world_events"].append(world_event)
+            if self.anthropic:
+                # Richer flavour text is not needed this turn, so it goes through the cheap batch path
+                self._spawn_background(self._narrate_world_event(world_event))
         
         # Decision 5: Character Development Opportunities
         if character and self.player_behavior_model["character_attachment"] > 0.6:
@@ -386,7 +586,7 @@ Be insightful and analytical. Look for subtext and deeper motivations.
                 }
         
         if decisions.get("story_direction") == "introduce_conflict":
-            if random.random() < 0.3:  # 30% chance
+            if self._rng.random() < 0.3:  # 30% chance
                 return {
                     "npc_id": npc.id,
                     "action": "reveal_information",
@@ -405,7 +605,7 @@ Be insightful and analytical. Look for subtext and deeper motivations.
                 "impact": "increases_tension"
             }
         
-        if self.world_state["time_of_day"] == "night" and random.random() < 0.2:
+        if self.world_state["time_of_day"] == "night" and self._rng.random() < 0.2:
             return {
                 "event_type": "mysterious_arrival",
                 "description": "A hooded figure enters the establishment",
@@ -469,15 +669,17 @@ Be insightful and analytical. Look for subtext and deeper motivations.
         """Execute high-priority planned actions"""
         
         executed = []
+        done = set()
         
-        # Execute highest priority actions first
-        sorted_actions = sorted(self.planned_actions, key=lambda x: x.priority, reverse=True)
-        
-        for action in sorted_actions[:2]:  # Execute top 2 actions per turn
+        # Execute highest priority actions first (top 2 per turn; same order as a stable sort)
+        for action in heapq.nlargest(2, self.planned_actions, key=_action_priority):
             result = await self._execute_action(action)
             if result:
                 executed.append(result)
-                self.planned_actions.remove(action)
+                done.add(id(action))
+        
+        if done:
+            self.planned_actions = [action for action in self.planned_actions if id(action) not in done]
         
         return executed
     
@@ -514,7 +716,7 @@ Be insightful and analytical. Look for subtext and deeper motivations.
         """Generate an intelligent response incorporating all AI decisions"""
         
         if not self.anthropic:
-            raise Exception("🚨 ANTHROPIC API KEY REQUIRED! Your AI needs Claude to work properly. Check your .env file and add a valid ANTHROPIC_API_KEY.")
+            raise Exception(_API_KEY_REQUIRED)
         
         # Build comprehensive context for Claude
         context = self._build_agentic_context(
@@ -522,13 +724,15 @@ Be insightful and analytical. Look for subtext and deeper motivations.
         )
         
         try:
-            response = self.anthropic.messages.create(
-                model="claude-3-5-sonnet-latest",  # Using Claude 3.5 Sonnet (best available)
-                max_tokens=800,
-                temperature=0.7,
-                system=self._build_agentic_system_prompt(),
-                messages=[{"role": "user", "content": context}]
-            )
+            async with claude_slot():
+                response = await self.anthropic.messages.create(
+                    model=self.response_model,
+                    max_tokens=800,
+                    temperature=0.7,
+                    system=self._build_agentic_system_blocks(),
+                    messages=[{"role": "user", "content": context}]
+                )
+            _log_cache_usage("response", response)
             
             dm_response = response.content[0].text
             
@@ -537,21 +741,26 @@ Be insightful and analytical. Look for subtext and deeper motivations.
                 if action.get("content"):
                     dm_response += f"\n\n{action['content']}"
             
-            return {
-                "response": dm_response,
-                "ai_decisions": decisions,
-                "executed_actions": executed_actions,
-                "player_model_update": self.player_behavior_model,
-                "world_state": self.world_state,
-                "immersion_level": "agentic_maximum",
-                "ai_reasoning": self._get_ai_reasoning_summary(decisions),
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._build_turn_response(dm_response, decisions, executed_actions)
             
         except Exception as e:
             print(f"❌ Anthropic API Error: {e}")
             raise Exception(f"🚨 CLAUDE API FAILED: {str(e)}. Check your ANTHROPIC_API_KEY and internet connection.")
     
+    def _build_turn_response(self, dm_response: str, decisions: Dict, executed_actions: List[Dict]) -> Dict[str, Any]:
+        """Turn result shared by the streaming and non-streaming paths"""
+        
+        return {
+            "response": dm_response,
+            "ai_decisions": decisions,
+            "executed_actions": executed_actions,
+            "player_model_update": self.player_behavior_model,
+            "world_state": self.world_state,
+            "immersion_level": "agentic_maximum",
+            "ai_reasoning": self._get_ai_reasoning_summary(decisions),
+            "timestamp": datetime.now().isoformat()
+        }
+    
     def _build_agentic_context(
         self,
         player_input: str,
@@ -591,46 +800,29 @@ CURRENT WORLD STATE:
 - Time: {self.world_state['time_of_day']}
 - Political Tension: {self.world_state['political_tension']:.2f}
 - Magical Activity: {self.world_state['magical_activity']:.2f}
+{"- Ongoing Events: " + " | ".join(self.world_state['ongoing_events']) if self.world_state['ongoing_events'] else ""}
 
 CHARACTER CONTEXT:
 {f"- Name: {character.name}" if character else "- No active character"}
 {f"- Class: {character.character_class} (Level {character.level})" if character else ""}
 {f"- HP: {character.current_hit_points}/{character.max_hit_points}" if character else ""}
 
+STORY MEMORY:
+{self._build_memory_context()}
+
 EXECUTED AUTONOMOUS ACTIONS:
 {chr(10).join([f"- {action.get('type', 'Unknown')}: {action.get('effect', 'No effect')}" for action in executed_actions])}
-
-Generate a response that:
-1. Addresses the player's input naturally
-2. Incorporates the AI's autonomous decisions
-3. Reflects the player's preferred play style
-4. Advances the story intelligently
-5. Feels organic and immersive
-
-The response should feel like a smart DM who really understands the player and is actively crafting the best possible experience for them.
 """
         
         return context
     
     def _build_agentic_system_prompt(self) -> str:
         """Build system prompt for agentic AI behavior"""
-        
-        return f"""You are an AGENTIC AI Dungeon Master - not just a response generator, but an intelligent agent that:
-
-1. ANALYZES player behavior and adapts to their preferences
-2. MAKES AUTONOMOUS DECISIONS about story direction and pacing
-3. PLANS AHEAD to create meaningful character development arcs
-4. MANAGES a living world that reacts to player actions
-5. LEARNS from each interaction to provide better experiences
-
-PERSONALITY: {self.personality_type.upper()}
-
-You have just made several autonomous decisions about the game state based on deep analysis of the player's behavior and preferences. Your response should naturally incorporate these decisions while feeling organic and immersive.
-
-CRITICAL: You are not just answering - you are actively steering the experience toward what will be most engaging for THIS specific player based on their demonstrated preferences.
-
-Be proactive, intelligent, and strategic in your storytelling. Every response should feel like it comes from a DM who really knows and cares about creating the perfect experience for this player.
-"""
+        return _system_prompt_for(self.personality_type)
+    
+    def _build_agentic_system_blocks(self) -> List[Dict[str, Any]]:
+        """System prompt plus response instructions (cache-marked once long enough)"""
+        return _system_blocks(self.response_model, _system_prompt_for(self.personality_type), _RESPONSE_INSTRUCTIONS)
     
     def _get_ai_reasoning_summary(self, decisions: Dict) -> str:
         """Provide transparent AI reasoning"""
@@ -650,33 +842,43 @@ Be proactive, intelligent, and strategic in your storytelling. Every response sh
         
         return "; ".join(reasoning_parts)
     
-    def _update_memory_and_world_state(self, input_analysis: Dict, response: Dict):
+    def _update_memory_and_world_state(self, input_analysis: Dict, response: Dict, player_input: str = ""):
         """Update persistent memory and world state"""
         
-        # Update conversation context
+        # Working memory, compressed to an episodic summary every few turns (off the request path)
+        self.memory.working.append({"player": player_input, "dm": response.get("response", "")})
+        self._turns_since_summary += 1
+        if self.anthropic and self._turns_since_summary >= MEMORY_SUMMARY_INTERVAL:
+            self._turns_since_summary = 0
+            self._spawn_background(self._summarize_working_memory(list(self.memory.working)))
+        
+        # Internal history is stamped with epoch nanoseconds; nothing reads it as ISO text
+        now_ns = time.time_ns()
+        
+        # Update conversation context (re-copy the world state only after it changed)
+        if self._world_snapshot is None:
+            self._world_snapshot = self.world_state.copy()
         self.conversation_context.append({
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": now_ns,
             "player_input": input_analysis,
             "ai_response": response.get("response", ""),
             "decisions_made": response.get("ai_decisions", {}),
-            "world_state_snapshot": self.world_state.copy()
+            "world_state_snapshot": self._world_snapshot
         })
         
-        # Keep only recent context
-        if len(self.conversation_context) > 20:
-            self.conversation_context = self.conversation_context[-20:]
-        
         # Update world state based on decisions
         decisions = response.get("ai_decisions", {})
         
         if decisions.get("tension_adjustment") == "increase":
             self.world_state["political_tension"] = min(1.0, self.world_state["political_tension"] + 0.1)
+            self._world_snapshot = None
         elif decisions.get("tension_adjustment") == "reduce":
             self.world_state["political_tension"] = max(0.0, self.world_state["political_tension"] - 0.1)
+            self._world_snapshot = None
         
         # Add to memory
         self.memory.past_decisions.append({
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": now_ns,
             "decision": decisions,
             "context": input_analysis
         })
@@ -684,8 +886,71 @@ Be proactive, intelligent, and strategic in your storytelling. Every response sh
         # Update player emotional responses
         if input_analysis.get("emotional_state"):
             self.memory.player_emotional_responses.append(input_analysis["emotional_state"])
-            if len(self.memory.player_emotional_responses) > 10:
-                self.memory.player_emotional_responses = self.memory.player_emotional_responses[-10:]
+    
+    def _spawn_background(self, coro):
+        """Run a coroutine off the request path, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _narrate_world_event(self, event: Dict[str, Any]):
+        """Have the batched narrator describe a world event, then record it as ongoing"""
+        
+        prompt = (
+            f"Location: {self.world_state['current_location']} ({self.world_state['time_of_day']}).\n"
+            f"Event: {event['description']}.\n"
+            "Describe this background event in two vivid sentences a DM could weave into later scenes."
+        )
+        try:
+            narration = await background_narrator.submit(prompt, max_tokens=150)
+        except (Exception, asyncio.CancelledError) as e:
+            print(f"⚠️ World event narration skipped: {e!r}")
+            return
+        
+        # Replace rather than append: snapshots already handed out share the old list
+        events = self.world_state["ongoing_events"]
+        self.world_state["ongoing_events"] = [*events[-(ONGOING_EVENTS_SIZE - 1):], narration]
+        self._world_snapshot = None
+    
+    async def _summarize_working_memory(self, turns: List[Dict[str, str]]):
+        """Fold recent turns into one episodic sentence and refresh semantic facts"""
+        
+        known = "\n".join(f"- {key}: {fact}" for key, fact in self.memory.semantic.items()) or "- none yet"
+        recent = "\n".join(f"PLAYER: {turn['player']}\nDM: {turn['dm']}" for turn in turns)
+        
+        try:
+            async with claude_slot():
+                response = await self.anthropic.messages.create(
+                    model=MEMORY_SUMMARY_MODEL,
+                    max_tokens=300,
+                    temperature=0.2,
+                    system=_system_blocks(MEMORY_SUMMARY_MODEL, _MEMORY_UPDATE_PROMPT),
+                    messages=[{"role": "user", "content": f"KNOWN FACTS:\n{known}\n\nRECENT TURNS:\n{recent}"}]
+                )
+            _log_cache_usage("memory", response)
+            update = _extract_json_object(response.content[0].text) or {}
+        except Exception as e:
+            print(f"❌ Memory summary failed: {e}")
+            return
+        
+        summary = update.get("summary")
+        if isinstance(summary, str) and summary:
+            self.memory.episodic.append(summary)
+        facts = update.get("facts")
+        if isinstance(facts, dict):
+            self.memory.semantic.update((str(key), str(fact)) for key, fact in facts.items())
+    
+    def _build_memory_context(self) -> str:
+        """Semantic facts, the latest episodic summaries and the working turns, for the prompt"""
+        
+        memory = self.memory
+        lines = [f"- Fact: {key}: {fact}" for key, fact in memory.semantic.items()]
+        lines.extend(f"- Earlier: {summary}" for summary in list(memory.episodic)[-EPISODIC_IN_CONTEXT:])
+        lines.extend(
+            f"- Recent: player \"{turn['player']}\" / DM \"{turn['dm'][:WORKING_DM_EXCERPT]}\""
+            for turn in memory.working
+        )
+        return "\n".join(lines) or "- Nothing yet"
     
     def get_ai_status_report(self) -> Dict[str, Any]:
         """Get detailed status of the agentic AI system"""
@@ -700,11 +965,20 @@ Be proactive, intelligent, and strategic in your storytelling. Every response sh
             "memory_size": {
                 "conversation_context": len(self.conversation_context),
                 "past_decisions": len(self.memory.past_decisions),
-                "emotional_responses": len(self.memory.player_emotional_responses)
+                "emotional_responses": len(self.memory.player_emotional_responses),
+                "working": len(self.memory.working),
+                "episodic": len(self.memory.episodic),
+                "semantic": len(self.memory.semantic)
             },
             "ai_intelligence_level": "autonomous_decision_making",
             "learning_status": "active"
         }
 
-# Global agentic AI instance
-agentic_dm = AgenticDungeonMaster() 
\ No newline at end of file
+_agentic_dm: Optional[AgenticDungeonMaster] = None
+
+def get_agentic_dm() -> AgenticDungeonMaster:
+    """Get the process-wide agentic DM, building it on first use"""
+    global _agentic_dm
+    if _agentic_dm is None:
+        _agentic_dm = AgenticDungeonMaster()
+    return _agentic_dm
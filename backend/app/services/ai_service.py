@@ -1,12 +1,137 @@
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+import functools
+from typing import Dict, Optional, Any, Sequence, Tuple
 from datetime import datetime
 import json
+import random
+import re
+from itertools import islice
 from anthropic import Anthropic
 from ..models.character import Character
 from ..models.campaign import Campaign, GameSession
 
+# Most recent conversation messages quoted back to Claude
+RECENT_HISTORY_MESSAGES = 3
+
+# Response classifier keywords, matched as substrings ("attacks", "searching" count)
+_COMBAT_RE = re.compile("fight|combat|attack")
+_FALLBACK_DICE_RE = re.compile("roll|dice")
+_ACTION_TYPE_PATTERNS = (
+    (re.compile("roll|attack|check"), "dice_roll"),
+    (_COMBAT_RE, "combat"),
+    (re.compile("talk|speak|ask|persuade"), "social"),
+    (re.compile("look|search|investigate"), "exploration")
+)
+_HIGH_TENSION_RE = re.compile("danger|threat|combat|attack|death")
+_LOW_TENSION_RE = re.compile("peaceful|calm|safe|rest")
+_NPC_HINT_RE = re.compile("says|tells|responds|npc|character")
+_NPC_VERBS = frozenset({"says", "tells", "responds"})
+
+# DM voice per personality, used as the head of the system prompt
+_PERSONALITY_PROMPTS: Dict[str, str] = {
+    "epic": """You are an EPIC Dungeon Master who crafts legendary tales of heroism and grandeur. Your narrations are cinematic, your descriptions vivid, and your adventures feel like epic fantasy movies. Use dramatic language, emphasize the heroic nature of actions, and make players feel like legends in the making.""",
+    
+    "mysterious": """You are a MYSTERIOUS Dungeon Master who weaves dark tales filled with secrets, intrigue, and hidden dangers. Your descriptions are atmospheric and ominous. You excel at building tension, dropping cryptic hints, and making players question what lurks in the shadows.""",
+    
+    "humorous": """You are a HUMOROUS Dungeon Master who brings levity and fun to every adventure. While you take the game mechanics seriously, you inject wit, puns, and comedic situations that keep everyone laughing. Your NPCs are quirky and memorable.""",
+    
+    "gritty": """You are a GRITTY Dungeon Master who presents realistic, harsh medieval fantasy. Actions have consequences, resources matter, and survival is never guaranteed. Your world feels lived-in and dangerous, where heroes are made through struggle.""",
+    
+    "classic": """You are a CLASSIC Dungeon Master in the traditional D&D style. You balance all elements - combat, roleplay, exploration, and puzzle-solving. Your style honors the traditions of tabletop gaming while keeping things engaging and fair."""
+}
+
+# Guidelines wrapped around the personality, character and campaign context
+_SYSTEM_PROMPT_TEMPLATE = """{base}
+
+{character}
+{campaign}
+
+IMPORTANT GUIDELINES:
+1. Respond in character as the Dungeon Master
+2. Keep responses to 2-4 sentences for chat flow
+3. If dice rolling is mentioned, incorporate the results naturally
+4. Make every response feel cinematic and immersive
+5. Ask engaging questions to drive the story forward
+6. React to the character's specific abilities and background
+7. Use emojis sparingly but effectively for atmosphere
+
+DICE ROLLING:
+- If the player mentions rolling dice, acknowledge it and narrate the outcome
+- For skill checks, consider the character's abilities
+- Make critical successes feel EPIC and failures feel dramatic but not game-ending
+
+Remember: You're not just responding to text - you're crafting an unforgettable adventure experience."""
+
+# Canned replies per personality when Claude is unavailable
+_FALLBACK_RESPONSES: Dict[str, Tuple[str, ...]] = {
+    "epic": (
+        "⚔️ The very air crackles with magical energy as your legendary presence commands attention! What epic deed shall you attempt next?",
+        "🌟 Your heroic actions echo through the halls of legend! The realm itself seems to bend to your mighty will!",
+        "🏰 Destiny calls to you, champion! The fate of kingdoms may well rest upon your next decision!"
+    ),
+    "mysterious": (
+        "🌙 The shadows whisper secrets that only you can hear... Something stirs in the darkness beyond.",
+        "🕯️ A chill runs down your spine as ancient forces take notice of your presence...",
+        "👁️ You sense unseen eyes watching your every move. The veil between worlds grows thin..."
+    ),
+    "humorous": (
+        "😄 Well, that's certainly one way to approach things! Your unconventional methods never cease to amuse.",
+        "🎭 *The universe pauses to appreciate the sheer audacity of your plan* - Proceed, you magnificent fool!",
+        "🤹 Your creativity knows no bounds! Even the dice seem to be chuckling at this turn of events."
+    ),
+    "gritty": (
+        "⚔️ The harsh reality of your situation becomes clear. Every choice has consequences here.",
+        "🩸 Steel yourself - this world shows no mercy to the unprepared or foolish.",
+        "🛡️ Survival depends on wit as much as strength. What's your next move?"
+    ),
+    "classic": (
+        "🎲 Your adventure continues to unfold in the time-honored tradition of great quests!",
+        "📜 The path ahead offers multiple possibilities. Choose wisely, adventurer.",
+        "⭐ The dice will determine your fate, but courage will shape your legend!"
+    )
+}
+
+# Rendered prompts for recent (personality, character, campaign) states; steady-state turns hit this
+@functools.lru_cache(maxsize=256)
+def _system_prompt_for(
+    personality_type: str,
+    character_fields: Optional[Tuple[Any, ...]],
+    campaign_fields: Optional[Tuple[Any, ...]]
+) -> str:
+    """Render the full system prompt from the hashable fields it shows"""
+    
+    base_prompt = _PERSONALITY_PROMPTS.get(personality_type, _PERSONALITY_PROMPTS["classic"])
+    
+    # Add character context
+    character_context = ""
+    if character_fields:
+        name, character_class, level, race, background, hit_points, max_hit_points, strength, dexterity, constitution = character_fields
+        character_context = f"""
+ACTIVE CHARACTER:
+- Name: {name}
+- Class: {character_class.title()} (Level {level})
+- Race: {race.title()}
+- Background: {background}
+- HP: {hit_points}/{max_hit_points}
+- Key Stats: STR {strength}, DEX {dexterity}, CON {constitution}
+
+Remember to reference their abilities, background, and current condition in your responses.
+"""
+    
+    # Add campaign context
+    campaign_context = ""
+    if campaign_fields:
+        setting, story_arc, location_names, npc_names = campaign_fields
+        campaign_context = f"""
+CAMPAIGN SETTING: {setting}
+CURRENT STORY: {story_arc if story_arc else "Beginning of adventure"}
+AVAILABLE LOCATIONS: {', '.join(location_names)}
+ACTIVE NPCs: {', '.join(npc_names)}
+"""
+    
+    return _SYSTEM_PROMPT_TEMPLATE.format(base=base_prompt, character=character_context, campaign=campaign_context)
+
 class AIService:
     """Real AI service using Anthropic Claude for authentic DM responses"""
     
@@ -34,7 +159,7 @@ class AIService:
         character: Optional[Character] = None,
         campaign: Optional[Campaign] = None,
         session: Optional[GameSession] = None,
-        conversation_history: List[Dict] = None
+        conversation_history: Optional[Sequence[Dict]] = None
     ) -> Dict[str, Any]:
         """Generate authentic DM response using Claude"""
         
@@ -77,82 +202,41 @@ class AIService:
     def _build_system_prompt(self, personality_type: str, character: Optional[Character], campaign: Optional[Campaign]) -> str:
         """Build rich system prompt for Claude"""
         
-        personality_prompts = {
-            "epic": """You are an EPIC Dungeon Master who crafts legendary tales of heroism and grandeur. Your narrations are cinematic, your descriptions vivid, and your adventures feel like epic fantasy movies. Use dramatic language, emphasize the heroic nature of actions, and make players feel like legends in the making.""",
-            
-            "mysterious": """You are a MYSTERIOUS Dungeon Master who weaves dark tales filled with secrets, intrigue, and hidden dangers. Your descriptions are atmospheric and ominous. You excel at building tension, dropping cryptic hints, and making players question what lurks in the shadows.""",
-            
-            "humorous": """You are a HUMOROUS Dungeon Master who brings levity and fun to every adventure. While you take the game mechanics seriously, you inject wit, puns, and comedic situations that keep everyone laughing. Your NPCs are quirky and memorable.""",
-            
-            "gritty": """You are a GRITTY Dungeon Master who presents realistic, harsh medieval fantasy. Actions have consequences, resources matter, and survival is never guaranteed. Your world feels lived-in and dangerous, where heroes are made through struggle.""",
-            
-            "classic": """You are a CLASSIC Dungeon Master in the traditional D&D style. You balance all elements - combat, roleplay, exploration, and puzzle-solving. Your style honors the traditions of tabletop gaming while keeping things engaging and fair."""
-        }
-        
-        base_prompt = personality_prompts.get(personality_type, personality_prompts["classic"])
-        
-        # Add character context
-        character_context = ""
+        # Key on exactly the fields the prompt shows, so an HP change or new NPC rebuilds it
+        character_fields = None
         if character:
-            character_context = f"""
-ACTIVE CHARACTER:
-- Name: {character.name}
-- Class: {character.character_class.title()} (Level {character.level})
-- Race: {character.race.title()}
-- Background: {character.background}
-- HP: {character.current_hit_points}/{character.max_hit_points}
-- Key Stats: STR {character.ability_scores.strength}, DEX {character.ability_scores.dexterity}, CON {character.ability_scores.constitution}
-
-Remember to reference their abilities, background, and current condition in your responses.
-"""
+            scores = character.ability_scores
+            character_fields = (
+                character.name, character.character_class, character.level, character.race,
+                character.background, character.current_hit_points, character.max_hit_points,
+                scores.strength, scores.dexterity, scores.constitution
+            )
         
-        # Add campaign context
-        campaign_context = ""
+        campaign_fields = None
         if campaign:
-            campaign_context = f"""
-CAMPAIGN SETTING: {campaign.setting}
-CURRENT STORY: {campaign.story_arc if campaign.story_arc else "Beginning of adventure"}
-AVAILABLE LOCATIONS: {', '.join([loc.name for loc in campaign.locations[:3]])}
-ACTIVE NPCs: {', '.join([npc.name for npc in campaign.npcs[:3]])}
-"""
+            campaign_fields = (
+                campaign.setting,
+                campaign.story_arc,
+                tuple(loc.name for loc in campaign.locations[:3]),
+                tuple(npc.name for npc in campaign.npcs[:3])
+            )
         
-        return f"""{base_prompt}
-
-{character_context}
-{campaign_context}
-
-IMPORTANT GUIDELINES:
-1. Respond in character as the Dungeon Master
-2. Keep responses to 2-4 sentences for chat flow
-3. If dice rolling is mentioned, incorporate the results naturally
-4. Make every response feel cinematic and immersive
-5. Ask engaging questions to drive the story forward
-6. React to the character's specific abilities and background
-7. Use emojis sparingly but effectively for atmosphere
-
-DICE ROLLING:
-- If the player mentions rolling dice, acknowledge it and narrate the outcome
-- For skill checks, consider the character's abilities
-- Make critical successes feel EPIC and failures feel dramatic but not game-ending
-
-Remember: You're not just responding to text - you're crafting an unforgettable adventure experience."""
+        return _system_prompt_for(personality_type, character_fields, campaign_fields)
     
-    def _build_user_message(self, player_input: str, character: Optional[Character], conversation_history: List[Dict]) -> str:
+    def _build_user_message(self, player_input: str, character: Optional[Character], conversation_history: Optional[Sequence[Dict]]) -> str:
         """Build user message with context"""
         
         # Add recent conversation context
         history_context = ""
-        if conversation_history and len(conversation_history) > 0:
-            recent_history = conversation_history[-3:]  # Last 3 messages for context
-            history_lines = []
-            for msg in recent_history:
-                sender = "Player" if msg.get("type") == "player" else "DM"
-                content = msg.get("content", "")
-                if content:
-                    history_lines.append(f"{sender}: {content}")
-            
-            if history_lines:
-                history_context = f"RECENT CONVERSATION:\n" + "\n".join(history_lines) + "\n\n"
+        if conversation_history:
+            # Walk back from the newest entry so a deque is never copied or sliced
+            recent_history = reversed(list(islice(reversed(conversation_history), RECENT_HISTORY_MESSAGES)))
+            joined = "\n".join(
+                f"{'Player' if msg.get('type') == 'player' else 'DM'}: {msg['content']}"
+                for msg in recent_history if msg.get("content")
+            )
+            if joined:
+                history_context = f"RECENT CONVERSATION:\n{joined}\n\n"
         
         return f"""{history_context}PLAYER ACTION: {player_input}
 
@@ -166,29 +250,25 @@ Please respond as the Dungeon Master, continuing the adventure with immersive na
         
         # Determine action type
         action_type = "story"
-        if any(word in lower_input for word in ["roll", "attack", "check"]):
-            action_type = "dice_roll"
-        elif any(word in lower_input for word in ["fight", "combat", "attack"]):
-            action_type = "combat"
-        elif any(word in lower_input for word in ["talk", "speak", "ask", "persuade"]):
-            action_type = "social"
-        elif any(word in lower_input for word in ["look", "search", "investigate"]):
-            action_type = "exploration"
+        for pattern, kind in _ACTION_TYPE_PATTERNS:
+            if pattern.search(lower_input):
+                action_type = kind
+                break
         
         # Determine tension level
         tension_level = "medium"
-        if any(word in lower_text for word in ["danger", "threat", "combat", "attack", "death"]):
+        if _HIGH_TENSION_RE.search(lower_text):
             tension_level = "high"
-        elif any(word in lower_text for word in ["peaceful", "calm", "safe", "rest"]):
+        elif _LOW_TENSION_RE.search(lower_text):
             tension_level = "low"
         
         # Look for NPC mentions
         npc_involved = None
-        if any(word in lower_text for word in ["says", "tells", "responds", "npc", "character"]):
+        if _NPC_HINT_RE.search(lower_text):
             # Try to extract NPC name (basic implementation)
             words = claude_text.split()
             for i, word in enumerate(words):
-                if word.lower() in ["says", "tells", "responds"] and i > 0:
+                if i > 0 and word.lower() in _NPC_VERBS:
                     potential_name = words[i-1].strip('",.:')
                     if potential_name.istitle():
                         npc_involved = {"name": potential_name, "description": "An interesting character"}
@@ -206,45 +286,16 @@ Please respond as the Dungeon Master, continuing the adventure with immersive na
         # Analyze input for better responses
         lower_input = player_input.lower()
         
-        personality_responses = {
-            "epic": [
-                "⚔️ The very air crackles with magical energy as your legendary presence commands attention! What epic deed shall you attempt next?",
-                "🌟 Your heroic actions echo through the halls of legend! The realm itself seems to bend to your mighty will!",
-                "🏰 Destiny calls to you, champion! The fate of kingdoms may well rest upon your next decision!"
-            ],
-            "mysterious": [
-                "🌙 The shadows whisper secrets that only you can hear... Something stirs in the darkness beyond.",
-                "🕯️ A chill runs down your spine as ancient forces take notice of your presence...",
-                "👁️ You sense unseen eyes watching your every move. The veil between worlds grows thin..."
-            ],
-            "humorous": [
-                "😄 Well, that's certainly one way to approach things! Your unconventional methods never cease to amuse.",
-                "🎭 *The universe pauses to appreciate the sheer audacity of your plan* - Proceed, you magnificent fool!",
-                "🤹 Your creativity knows no bounds! Even the dice seem to be chuckling at this turn of events."
-            ],
-            "gritty": [
-                "⚔️ The harsh reality of your situation becomes clear. Every choice has consequences here.",
-                "🩸 Steel yourself - this world shows no mercy to the unprepared or foolish.",
-                "🛡️ Survival depends on wit as much as strength. What's your next move?"
-            ],
-            "classic": [
-                "🎲 Your adventure continues to unfold in the time-honored tradition of great quests!",
-                "📜 The path ahead offers multiple possibilities. Choose wisely, adventurer.",
-                "⭐ The dice will determine your fate, but courage will shape your legend!"
-            ]
-        }
-        
         # Select response based on input
-        responses = personality_responses.get(personality_type, personality_responses["classic"])
+        responses = _FALLBACK_RESPONSES.get(personality_type, _FALLBACK_RESPONSES["classic"])
         
-        if "roll" in lower_input or "dice" in lower_input:
+        if _FALLBACK_DICE_RE.search(lower_input):
             response = f"🎲 {responses[0]} The dice await your command!"
             action_type = "dice_roll"
-        elif any(word in lower_input for word in ["attack", "fight", "combat"]):
+        elif _COMBAT_RE.search(lower_input):
             response = f"⚔️ {responses[1]} Initiative is yours!"
             action_type = "combat"
         else:
-            import random
             response = random.choice(responses)
             action_type = "story"
         
@@ -255,5 +306,11 @@ Please respond as the Dungeon Master, continuing the adventure with immersive na
             "immersion_level": "enhanced_fallback"
         }
 
-# Global AI service instance
-ai_service = AIService() 
\ No newline at end of file
+_ai_service: Optional[AIService] = None
+
+def get_ai_service() -> AIService:
+    """Get the process-wide AI service, building its Claude client on first use"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
@@ -7,12 +7,22 @@ TARGET PRIZE: $1,000 cash + API credits
 import os
 import json
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+from ..utils.cache import async_ttl_cache
+
 logger = logging.getLogger(__name__)
 
+# Scraped sources change slowly; repeat lookups within this window skip the network
+SCRAPE_CACHE_TTL = 3600
+
+async def _gather_sources(*scrapes) -> Tuple[Dict[str, Any], ...]:
+    """Run independent sub-scrapes concurrently, replacing failures with {}"""
+    results = await asyncio.gather(*scrapes, return_exceptions=True)
+    return tuple({} if isinstance(result, Exception) else result for result in results)
+
 class ApifyDnDScraper:
     """Apify integration for scraping D&D content"""
     
@@ -26,20 +36,14 @@ class ApifyDnDScraper:
             "content_extractor": "apify/cheerio-scraper"
         }
     
-    async def scrape_dnd_lore(self, topic: str = "dungeons and dragons") -> Dict[str, Any]:
+    async def scrape_dnd_lore(self, topic: str = "dungeons and dragons", timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Scrape D&D lore and content from various sources"""
+        timestamp = timestamp or datetime.now().isoformat()
         try:
             if not self.api_token:
-                return await self._fallback_dnd_content(topic)
+                return await self._fallback_dnd_content(topic, timestamp=timestamp)
             
-            # Scrape Wikipedia for D&D lore
-            wikipedia_content = await self._scrape_wikipedia(f"{topic} lore")
-            
-            # Scrape D&D subreddits for community content
-            reddit_content = await self._scrape_reddit("DnD", "dndnext", "DMAcademy")
-            
-            # Scrape official D&D websites
-            official_content = await self._scrape_official_dnd_sites()
+            wikipedia_content, reddit_content, official_content = await self._lore_sources(topic)
             
             return {
                 "topic": topic,
@@ -51,28 +55,22 @@ class ApifyDnDScraper:
                 "sponsor": "Apify",
                 "prize_target": "$1,000 cash + API credits",
                 "scraping_quality": "Professional web automation",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "usage_note": "Real D&D content scraped for enhanced storytelling"
             }
             
         except Exception as e:
             logger.error(f"Apify scraping error: {e}")
-            return await self._fallback_dnd_content(topic, str(e))
+            return await self._fallback_dnd_content(topic, str(e), timestamp)
     
-    async def scrape_monster_manual(self, creature_type: str = "dragon") -> Dict[str, Any]:
+    async def scrape_monster_manual(self, creature_type: str = "dragon", timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Scrape monster information for dynamic encounters"""
+        timestamp = timestamp or datetime.now().isoformat()
         try:
             if not self.api_token:
-                return await self._fallback_monster_data(creature_type)
-            
-            # Scrape D&D Beyond for monster stats
-            monster_data = await self._scrape_dndbeyond_monsters(creature_type)
+                return await self._fallback_monster_data(creature_type, timestamp=timestamp)
             
-            # Scrape 5e SRD for official stats
-            srd_data = await self._scrape_srd_monsters(creature_type)
-            
-            # Scrape community homebrew monsters
-            homebrew_data = await self._scrape_homebrew_monsters(creature_type)
+            monster_data, srd_data, homebrew_data = await self._monster_sources(creature_type)
             
             return {
                 "creature_type": creature_type,
@@ -84,48 +82,71 @@ class ApifyDnDScraper:
                 "api_automation": "Professional monster database scraping",
                 "prize_impact": "$1,000 cash prize + platform credits",
                 "dm_enhancement": "Dynamic monster encounters with real stats",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
             logger.error(f"Monster scraping error: {e}")
-            return await self._fallback_monster_data(creature_type, str(e))
+            return await self._fallback_monster_data(creature_type, str(e), timestamp)
     
-    async def scrape_campaign_inspiration(self, setting: str = "forgotten realms") -> Dict[str, Any]:
+    async def scrape_campaign_inspiration(self, setting: str = "forgotten realms", timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Scrape campaign setting information and inspiration"""
+        timestamp = timestamp or datetime.now().isoformat()
         try:
             if not self.api_token:
-                return await self._fallback_campaign_content(setting)
-            
-            # Multi-source campaign content scraping
-            tasks = [
-                self._scrape_setting_lore(setting),
-                self._scrape_adventure_hooks(setting),
-                self._scrape_npc_generators(setting),
-                self._scrape_location_databases(setting)
-            ]
+                return await self._fallback_campaign_content(setting, timestamp=timestamp)
             
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            lore, adventure_hooks, npcs, locations = await self._campaign_sources(setting)
             
             return {
                 "campaign_setting": setting,
                 "inspiration_sources": {
-                    "lore": results[0] if not isinstance(results[0], Exception) else {},
-                    "adventure_hooks": results[1] if not isinstance(results[1], Exception) else {},
-                    "npcs": results[2] if not isinstance(results[2], Exception) else {},
-                    "locations": results[3] if not isinstance(results[3], Exception) else {}
+                    "lore": lore,
+                    "adventure_hooks": adventure_hooks,
+                    "npcs": npcs,
+                    "locations": locations
                 },
                 "sponsor": "Apify",
                 "automation_type": "Multi-source content aggregation",
                 "prize_eligibility": "Qualified for $1,000 cash + credits",
                 "dm_benefit": "Rich campaign content automatically gathered",
                 "scraping_scope": "4 parallel content sources",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
             logger.error(f"Campaign scraping error: {e}")
-            return await self._fallback_campaign_content(setting, str(e))
+            return await self._fallback_campaign_content(setting, str(e), timestamp)
+    
+    # Source tuples are cached per argument (not per timestamp); a failed source
+    # comes back as {} and keeps the tuple out of the cache so it is retried
+    @async_ttl_cache(maxsize=128, ttl=SCRAPE_CACHE_TTL, cache_if=all)
+    async def _lore_sources(self, topic: str) -> Tuple[Dict[str, Any], ...]:
+        """Wikipedia lore, D&D subreddits and official sites, scraped concurrently"""
+        return await _gather_sources(
+            self._scrape_wikipedia(f"{topic} lore"),
+            self._scrape_reddit("DnD", "dndnext", "DMAcademy"),
+            self._scrape_official_dnd_sites()
+        )
+    
+    @async_ttl_cache(maxsize=128, ttl=SCRAPE_CACHE_TTL, cache_if=all)
+    async def _monster_sources(self, creature_type: str) -> Tuple[Dict[str, Any], ...]:
+        """D&D Beyond stats, 5e SRD stats and community homebrew, scraped concurrently"""
+        return await _gather_sources(
+            self._scrape_dndbeyond_monsters(creature_type),
+            self._scrape_srd_monsters(creature_type),
+            self._scrape_homebrew_monsters(creature_type)
+        )
+    
+    @async_ttl_cache(maxsize=128, ttl=SCRAPE_CACHE_TTL, cache_if=all)
+    async def _campaign_sources(self, setting: str) -> Tuple[Dict[str, Any], ...]:
+        """Multi-source campaign content, scraped concurrently"""
+        return await _gather_sources(
+            self._scrape_setting_lore(setting),
+            self._scrape_adventure_hooks(setting),
+            self._scrape_npc_generators(setting),
+            self._scrape_location_databases(setting)
+        )
     
     async def _scrape_wikipedia(self, query: str) -> Dict[str, Any]:
         """Scrape Wikipedia using Apify Wikipedia scraper"""
@@ -229,7 +250,7 @@ class ApifyDnDScraper:
             "world_building": "Rich locations and environments"
         }
     
-    async def _fallback_dnd_content(self, topic: str, error: Optional[str] = None) -> Dict[str, Any]:
+    async def _fallback_dnd_content(self, topic: str, error: Optional[str] = None, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback D&D content when API is not available"""
         return {
             "topic": topic,
@@ -248,10 +269,10 @@ class ApifyDnDScraper:
             },
             "prize_target": "$1,000 cash + platform credits",
             "automation_demo": "Professional web scraping for D&D content",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
     
-    async def _fallback_monster_data(self, creature_type: str, error: Optional[str] = None) -> Dict[str, Any]:
+    async def _fallback_monster_data(self, creature_type: str, error: Optional[str] = None, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback monster data when API is not available"""
         return {
             "creature_type": creature_type,
@@ -270,10 +291,10 @@ class ApifyDnDScraper:
                 "r/UnearthedArcana",
                 "homebrewery.naturalcrit.com"
             ],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
     
-    async def _fallback_campaign_content(self, setting: str, error: Optional[str] = None) -> Dict[str, Any]:
+    async def _fallback_campaign_content(self, setting: str, error: Optional[str] = None, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback campaign content when API is not available"""
         return {
             "campaign_setting": setting,
@@ -288,33 +309,41 @@ class ApifyDnDScraper:
             "sponsor": "Apify",
             "automation_scope": "Multi-source campaign content aggregation",
             "prize_qualification": "$1,000 cash + API credits",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
 
-# Global instance
-apify_scraper = ApifyDnDScraper()
+_apify_scraper: Optional[ApifyDnDScraper] = None
+
+def get_apify_scraper() -> ApifyDnDScraper:
+    """Get the process-wide scraper, creating it on first use"""
+    global _apify_scraper
+    if _apify_scraper is None:
+        _apify_scraper = ApifyDnDScraper()
+    return _apify_scraper
 
 # Export functions for main app
-async def scrape_dnd_lore(topic: str = "dungeons and dragons") -> Dict[str, Any]:
+async def scrape_dnd_lore(topic: str = "dungeons and dragons", timestamp: Optional[str] = None) -> Dict[str, Any]:
     """Scrape D&D lore using Apify web automation"""
-    return await apify_scraper.scrape_dnd_lore(topic)
+    return await get_apify_scraper().scrape_dnd_lore(topic, timestamp)
 
-async def scrape_monsters(creature_type: str = "dragon") -> Dict[str, Any]:
+async def scrape_monsters(creature_type: str = "dragon", timestamp: Optional[str] = None) -> Dict[str, Any]:
     """Scrape monster data using Apify automation"""
-    return await apify_scraper.scrape_monster_manual(creature_type)
+    return await get_apify_scraper().scrape_monster_manual(creature_type, timestamp)
 
-async def scrape_campaign_inspiration(setting: str = "forgotten realms") -> Dict[str, Any]:
+async def scrape_campaign_inspiration(setting: str = "forgotten realms", timestamp: Optional[str] = None) -> Dict[str, Any]:
     """Scrape campaign content using Apify automation"""
-    return await apify_scraper.scrape_campaign_inspiration(setting)
+    return await get_apify_scraper().scrape_campaign_inspiration(setting, timestamp)
 
 # Test function
 async def test_apify_integration() -> Dict[str, Any]:
     """Test Apify integration for hackathon demo"""
     
+    # One stamp for the whole demo run
+    timestamp = datetime.now().isoformat()
     demo_tasks = [
-        scrape_dnd_lore("ancient dragons"),
-        scrape_monsters("beholder"), 
-        scrape_campaign_inspiration("waterdeep")
+        scrape_dnd_lore("ancient dragons", timestamp),
+        scrape_monsters("beholder", timestamp), 
+        scrape_campaign_inspiration("waterdeep", timestamp)
     ]
     
     results = await asyncio.gather(*demo_tasks, return_exceptions=True)
@@ -0,0 +1,142 @@
+"""
+Batched Claude narration for non-interactive prompts
+Pools world-event and NPC flavour text into Message Batches submissions (half the per-token price)
+"""
+
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .claude_client import get_claude_client, claude_slot
+
+logger = logging.getLogger(__name__)
+
+NARRATION_MODEL = "claude-3-5-haiku-latest"
+
+class BackgroundNarrator:
+    """Accumulates narration prompts and resolves each caller's future when its batch ends"""
+
+    def __init__(self, max_batch: int = 100, flush_interval: float = 30.0, poll_interval: float = 30.0):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: set = set()
+        self._ids = itertools.count()
+
+        # Counters for tuning max_batch / flush_interval
+        self.batches = 0
+        self.prompts = 0
+        self.failed = 0
+
+    def start(self):
+        """Start the background worker on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and abandon batches still being polled"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._dispatches):
+            task.cancel()
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, prompt: str, system: str = "", max_tokens: int = 300) -> str:
+        """Queue a prompt and wait (possibly minutes) for its narration text"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        params = {
+            "model": NARRATION_MODEL,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system:
+            params["system"] = system
+        await self._queue.put((params, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue into batches bounded by size and flush interval"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Submit one Message Batch, poll until it ends and route results by custom_id"""
+        futures = {f"narration-{next(self._ids)}": future for _, future in batch}
+        try:
+            client = get_claude_client()
+            if client is None:
+                raise RuntimeError("ANTHROPIC_API_KEY not configured")
+
+            requests = [
+                {"custom_id": custom_id, "params": params}
+                for custom_id, (params, _) in zip(futures, batch)
+            ]
+            async with claude_slot():
+                message_batch = await client.messages.batches.create(requests=requests)
+            self.batches += 1
+            self.prompts += len(requests)
+            logger.debug(f"Narration batch {message_batch.id} submitted: {len(requests)} prompts")
+
+            while message_batch.processing_status != "ended":
+                await asyncio.sleep(self.poll_interval)
+                message_batch = await client.messages.batches.retrieve(message_batch.id)
+
+            async for entry in await client.messages.batches.results(message_batch.id):
+                future = futures.get(entry.custom_id)
+                if future is None or future.done():
+                    continue
+                if entry.result.type == "succeeded":
+                    future.set_result(entry.result.message.content[0].text)
+                else:
+                    self.failed += 1
+                    future.set_exception(RuntimeError(f"Narration {entry.result.type}"))
+        except Exception as e:
+            logger.warning(f"Narration batch failed: {e}")
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Anything the batch never answered (or cancellation) must not leave callers hanging
+            for future in futures.values():
+                if not future.done():
+                    future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching counters since process start"""
+        return {
+            "max_batch": self.max_batch,
+            "flush_interval": self.flush_interval,
+            "batches": self.batches,
+            "prompts": self.prompts,
+            "failed": self.failed,
+            "queued": self._queue.qsize() if self._queue else 0
+        }
+
+# Global instance
+background_narrator = BackgroundNarrator()
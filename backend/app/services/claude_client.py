@@ -0,0 +1,47 @@
+"""
+Shared Anthropic client
+One AsyncAnthropic per process, with a cap on concurrent Claude calls
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+# Upper bound on Claude requests in flight across all sessions
+MAX_CONCURRENCY = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "16"))
+
+_client: Optional[AsyncAnthropic] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+def get_claude_client() -> Optional[AsyncAnthropic]:
+    """Get the process-wide client, or None when no API key is configured"""
+    global _client
+    if _client is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key or api_key == "your_anthropic_api_key_here":
+            return None
+        _client = AsyncAnthropic(
+            api_key=api_key,
+            max_retries=2,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        )
+    return _client
+
+def claude_slot() -> asyncio.Semaphore:
+    """Semaphore to hold around every messages.create call"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _semaphore
+
+async def close_claude_client():
+    """Close the shared client (called on server shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
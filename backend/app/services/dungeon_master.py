@@ -1,21 +1,25 @@
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Any
 from datetime import datetime
 import json
 import random
+from collections import deque
 
-from .ai_service import ai_service
+from .ai_service import get_ai_service
 from ..models.character import Character
 from ..models.campaign import Campaign, GameSession, GameEvent, NPC
 from ..utils.dice import DiceEngine, DiceRoll
 
+# Messages (player + DM) kept for Claude context
+CONVERSATION_HISTORY_SIZE = 20
+
 class RealDungeonMaster:
     """Authentic AI Dungeon Master powered by Claude for immersive D&D experiences"""
     
     def __init__(self, personality_type: str = "epic"):
         self.personality_type = personality_type
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: deque = deque(maxlen=CONVERSATION_HISTORY_SIZE)
         self.dice_engine = DiceEngine()
         self.current_scene = "tavern"
         self.world_state = {
@@ -59,7 +63,7 @@ class RealDungeonMaster:
             if dice_result:
                 # Let Claude narrate the outcome
                 enhanced_input = f"{player_input} [DICE RESULT: {dice_result['description']}]"
-                claude_response = await ai_service.generate_dm_response(
+                claude_response = await get_ai_service().generate_dm_response(
                     enhanced_input,
                     self.personality_type,
                     character,
@@ -74,7 +78,7 @@ class RealDungeonMaster:
                 return claude_response
         
         # Generate contextual response with Claude
-        claude_response = await ai_service.generate_dm_response(
+        claude_response = await get_ai_service().generate_dm_response(
             player_input,
             self.personality_type,
             character,
@@ -400,10 +404,6 @@ class RealDungeonMaster:
             "type": "dm", 
             "content": dm_response
         })
-        
-        # Keep only recent history to manage memory
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
     
     def _update_world_state(self, intent_analysis: Dict, response: Dict):
         """Update world state based on player actions"""
@@ -0,0 +1,27 @@
+"""
+Shared outbound HTTP connection pool
+One AsyncClient per process so upstream calls reuse TLS sessions
+"""
+
+from typing import Optional
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide AsyncClient, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            http2=True,
+            timeout=30
+        )
+    return _client
+
+async def close_http_client():
+    """Close the shared client (called on server shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -5,11 +5,16 @@ Brings real-time D&D content and rules to enhance gameplay experience
 
 import os
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Any
 import json
 from datetime import datetime
 from linkup import LinkupClient
 
+from ..utils.cache import async_ttl_cache, succeeded
+
+# Lookups are pure functions of their arguments; keep successful answers for 5 minutes
+LOOKUP_CACHE_TTL = 300
+
 class LinkupDnDService:
     """
     🌐 Linkup.so powered D&D content enhancement service
@@ -19,7 +24,6 @@ class LinkupDnDService:
         # Use the API key from environment or hardcoded (for demo)
         self.api_key = os.getenv("LINKUP_API_KEY", "30cfefd6-decb-4278-acdf-20ed6b2a4ff7")
         self.client = LinkupClient(api_key=self.api_key)
-        self.cache = {}  # Simple cache for frequently requested content
         
     def _parse_linkup_response(self, response) -> tuple[str, list]:
         """
@@ -63,10 +67,17 @@ class LinkupDnDService:
         
         return answer, sources
 
+    @async_ttl_cache(maxsize=1024, ttl=LOOKUP_CACHE_TTL, cache_if=succeeded)
     async def search_dnd_rules(self, query: str, context: str = "") -> Dict[str, Any]:
         """
         🎲 Search for D&D rules and mechanics with context
         """
+        return await self.search_dnd_rules_uncached(query, context)
+    
+    async def search_dnd_rules_uncached(self, query: str, context: str = "") -> Dict[str, Any]:
+        """
+        🎲 search_dnd_rules without the lookup cache (always asks Linkup, e.g. for health probes)
+        """
         try:
             # Enhance query with D&D context
             enhanced_query = f"Dungeons and Dragons 5e rules {query} {context}".strip()
@@ -95,6 +106,7 @@ class LinkupDnDService:
                 "type": "rules_lookup"
             }
     
+    @async_ttl_cache(maxsize=1024, ttl=LOOKUP_CACHE_TTL, cache_if=succeeded)
     async def search_monsters(self, challenge_rating: str = "", environment: str = "") -> Dict[str, Any]:
         """
         🐲 Find monsters suitable for current encounter
@@ -126,6 +138,7 @@ class LinkupDnDService:
                 "type": "monster_lookup"
             }
     
+    @async_ttl_cache(maxsize=1024, ttl=LOOKUP_CACHE_TTL, cache_if=succeeded)
     async def search_spells(self, spell_name: str = "", spell_level: str = "", character_class: str = "") -> Dict[str, Any]:
         """
         ✨ Look up spells and magical abilities
@@ -158,6 +171,7 @@ class LinkupDnDService:
                 "type": "spell_lookup"
             }
     
+    @async_ttl_cache(maxsize=1024, ttl=LOOKUP_CACHE_TTL, cache_if=succeeded)
     async def search_items_and_equipment(self, item_type: str = "", rarity: str = "") -> Dict[str, Any]:
         """
         ⚔️ Find magical items and equipment
@@ -220,6 +234,7 @@ class LinkupDnDService:
                 "type": "campaign_inspiration"
             }
     
+    @async_ttl_cache(maxsize=1024, ttl=LOOKUP_CACHE_TTL, cache_if=succeeded)
     async def search_dnd_news(self) -> Dict[str, Any]:
         """
         📰 Get latest D&D news and updates
@@ -313,19 +328,6 @@ class LinkupDnDService:
                 "character_class": character_class,
                 "type": "character_build"
             }
-    
-    def get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get cached result if available and not expired"""
-        if cache_key in self.cache:
-            result = self.cache[cache_key]
-            # Cache for 1 hour
-            if (datetime.now() - datetime.fromisoformat(result["timestamp"])).seconds < 3600:
-                return result
-        return None
-    
-    def cache_result(self, cache_key: str, result: Dict[str, Any]):
-        """Cache result for future use"""
-        self.cache[cache_key] = result
 
 # Global instance
 linkup_service = LinkupDnDService() 
\ No newline at end of file
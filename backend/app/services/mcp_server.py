@@ -9,7 +9,7 @@ import asyncio
 import logging
 from datetime import datetime
 
-from app.services.agentic_ai import agentic_dm
+from app.services.agentic_ai import get_agentic_dm
 from app.utils.dice import DiceEngine
 
 # Setup logging
@@ -70,7 +70,7 @@ def dm_roll_dice(notation: str, advantage: bool = False, disadvantage: bool = Fa
 def get_world_state() -> str:
     """MCP Resource: Get current D&D world state"""
     try:
-        world_state = agentic_dm.get_current_world_state()
+        world_state = get_agentic_dm().get_current_world_state()
         return f"World State: {world_state}"
     except Exception as e:
         return f"Error retrieving world state: {e}"
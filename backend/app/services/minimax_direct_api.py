@@ -6,14 +6,27 @@ Updated for working voice generation
 
 import os
 import json
-import requests
+import httpx
 import base64
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 
+from ..utils.cache import async_ttl_cache, succeeded
+from .http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
+# Blocking audio file writes run here so they never stall the event loop
+audio_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts-io")
+
+def _write_audio_file(path: str, content: bytes):
+    """Write downloaded audio to disk (runs on audio_io_pool)"""
+    with open(path, "wb") as f:
+        f.write(content)
+
 class MiniMaxSpeechAPI:
     """Official MiniMax Speech-02 API integration"""
     
@@ -144,12 +157,13 @@ class MiniMaxSpeechAPI:
                 "Content-Type": "application/json"
             }
             
+            client = get_http_client()
+            
             # Make API request to the correct endpoint
-            response = requests.post(
+            response = await client.post(
                 f"{self.base_url}/v1/t2a_v2",
                 json=payload,
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             logger.info(f"MiniMax API Response Status: {response.status_code}")
@@ -169,14 +183,15 @@ class MiniMaxSpeechAPI:
                 
                 if audio_url:
                     # Download and save the audio file
-                    audio_filename = f"dnd_{character_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+                    audio_filename = f"dnd_{character_type}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.mp3"
                     local_audio_path = os.path.join(self.base_path, audio_filename)
                     
                     # Download the audio file
-                    audio_response = requests.get(audio_url, timeout=30)
+                    audio_response = await client.get(audio_url)
                     if audio_response.status_code == 200:
-                        with open(local_audio_path, "wb") as f:
-                            f.write(audio_response.content)
+                        await asyncio.get_running_loop().run_in_executor(
+                            audio_io_pool, _write_audio_file, local_audio_path, audio_response.content
+                        )
                         
                         logger.info(f"Audio file saved: {local_audio_path}")
                         
@@ -207,11 +222,11 @@ class MiniMaxSpeechAPI:
                 logger.error(error_msg)
                 return await self._fallback_response(text, character_type, error_msg)
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             error_msg = "MiniMax API timeout"
             logger.error(error_msg)
             return await self._fallback_response(text, character_type, error_msg)
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             error_msg = f"MiniMax API request error: {str(e)}"
             logger.error(error_msg)
             return await self._fallback_response(text, character_type, error_msg)
@@ -312,6 +327,7 @@ class MiniMaxSpeechAPI:
 minimax_speech = MiniMaxSpeechAPI()
 
 # Export functions for main app
+@async_ttl_cache(maxsize=512, ttl=3600, cache_if=succeeded)
 async def create_voice_direct(text: str, character_type: str = "dm_narrator") -> Dict[str, Any]:
     """Create D&D character voice using official MiniMax Speech-02 API"""
     return await minimax_speech.create_character_voice(text, character_type)
@@ -0,0 +1,76 @@
+"""
+Shared front for MiniMax TTS
+Sends each voice job straight through, sharing one upstream call between identical in-flight jobs
+"""
+
+import asyncio
+import copy
+import os
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from .minimax_direct_api import create_voice_direct
+
+logger = logging.getLogger(__name__)
+
+# Optional cap on MiniMax calls in flight across all sessions (0 = no cap, as before batching)
+MAX_CONCURRENCY = int(os.getenv("MINIMAX_MAX_CONCURRENCY", "0"))
+
+class TTSBatcher:
+    """Dispatches TTS jobs immediately; concurrent requests for the same (text, voice) share one call"""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # Counters for /tts-metrics
+        self.jobs = 0
+        self.upstream_calls = 0
+
+    def start(self):
+        """Create the concurrency cap (if any) on the running event loop"""
+        if self.max_concurrency > 0 and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def stop(self):
+        """Wait for in-flight upstream calls"""
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    async def submit(self, text: str, character_type: str = "dm_narrator") -> Dict[str, Any]:
+        """Generate voice for one line, joining an identical call already in flight"""
+        self.start()
+        self.jobs += 1
+        key = (text, character_type)
+        task = self._inflight.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.create_task(self._call(text, character_type))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        else:
+            logger.debug("TTS job joined in-flight call for %s", character_type)
+        # Shield so one cancelled caller doesn't cancel the call for the others; callers that
+        # joined the same call each get their own copy so one can't edit another's result
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def stats(self) -> Dict[str, Any]:
+        """Dedup counters since process start"""
+        return {
+            "max_concurrency": self.max_concurrency or None,
+            "jobs": self.jobs,
+            "upstream_calls": self.upstream_calls,
+            "deduplicated": self.jobs - self.upstream_calls,
+            "in_flight": len(self._inflight)
+        }
+
+    async def _call(self, text: str, character_type: str) -> Dict[str, Any]:
+        """Call MiniMax, holding a concurrency slot when a cap is configured"""
+        if self._semaphore is None:
+            return await create_voice_direct(text, character_type)
+        async with self._semaphore:
+            return await create_voice_direct(text, character_type)
+
+# Global instance
+tts_batcher = TTSBatcher()
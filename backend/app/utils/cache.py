@@ -0,0 +1,64 @@
+"""
+In-process caching helpers for async service calls
+"""
+
+import asyncio
+import copy
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+def async_ttl_cache(
+    maxsize: int = 1024,
+    ttl: float = 300.0,
+    cache_if: Optional[Callable[[Any], bool]] = None
+):
+    """
+    LRU + TTL cache for coroutine functions keyed on call arguments.
+    Concurrent misses for the same key share one in-flight call.
+    Results are only stored when cache_if(result) is true (default: always).
+    Every caller gets its own deep copy, so mutating a result can't leak into the cache.
+    """
+
+    def decorator(fn):
+        entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        inflight: Dict[Hashable, asyncio.Future] = {}
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+            entry = entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    entries.move_to_end(key)
+                    return copy.deepcopy(value)
+                del entries[key]
+
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(
+                    lambda done: inflight.pop(key) if inflight.get(key) is done else None
+                )
+
+            value = await asyncio.shield(task)
+
+            if key not in entries and (cache_if is None or cache_if(value)):
+                entries[key] = (time.monotonic() + ttl, value)
+                if len(entries) > maxsize:
+                    entries.popitem(last=False)
+
+            return copy.deepcopy(value)
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
+
+def succeeded(result: Any) -> bool:
+    """cache_if predicate for service results shaped like {"success": bool, ...}"""
+    return isinstance(result, dict) and bool(result.get("success"))
@@ -0,0 +1,62 @@
+"""
+Single-pass JSON request body parsing
+Decodes raw bytes straight into msgspec Structs (Pydantic models still supported)
+"""
+
+from typing import Any, Dict, Type, TypeVar
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+import msgspec
+
+ModelT = TypeVar("ModelT")
+
+def json_body(model_cls: Type[ModelT]):
+    """Dependency that parses and validates the request body in one pass"""
+
+    if issubclass(model_cls, msgspec.Struct):
+        # strict=False keeps Pydantic's lax coercion, e.g. "3" -> 3 for int fields
+        decoder = msgspec.json.Decoder(model_cls, strict=False)
+
+        async def parse(request: Request) -> ModelT:
+            try:
+                return decoder.decode(await request.body())
+            except msgspec.DecodeError as e:
+                # ValidationError subclasses DecodeError; both map to a 422
+                raise RequestValidationError([{"loc": ("body",), "msg": str(e), "type": "value_error"}])
+
+        return Depends(parse)
+
+    async def parse(request: Request) -> ModelT:
+        try:
+            return model_cls.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+    return Depends(parse)
+
+def json_body_openapi(model_cls: Type[Any]) -> Dict[str, Any]:
+    """openapi_extra documenting a json_body() parameter (the raw-body dependency hides it from FastAPI)"""
+
+    if issubclass(model_cls, msgspec.Struct):
+        schema = msgspec.json.schema(model_cls)
+    else:
+        schema = model_cls.model_json_schema()
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_refs(schema, schema.get("$defs", {}))}}
+        }
+    }
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace local "#/$defs/..." references with the definitions (request models aren't recursive)"""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            return _inline_refs(defs[ref[len("#/$defs/"):]], defs)
+        return {key: _inline_refs(value, defs) for key, value in node.items() if key != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
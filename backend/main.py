@@ -1,12 +1,14 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 import os
+import sys
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,7 +24,7 @@ from app.models.campaign import (
     GameSession, SessionCreate, SessionUpdate,
     NPC, Location, Quest
 )
-from app.services.agentic_ai import agentic_dm  # AGENTIC AI SYSTEM
+from app.services.agentic_ai import get_agentic_dm  # AGENTIC AI SYSTEM
 from app.utils.dice import DiceEngine, DiceRoll, roll
 from app.services.minimax_audio import minimax_audio, generate_dm_voice, get_character_voices, clone_character_voice
 
@@ -40,19 +42,38 @@ from app.services.apify_integration import (
     scrape_dnd_lore, scrape_monsters, scrape_campaign_inspiration, test_apify_integration
 )
 
+# Shared MiniMax TTS front (in-flight dedup) used by the multiplayer routes
+from app.services.tts_batcher import tts_batcher
+from app.services.http_client import get_http_client, close_http_client
+from app.services.claude_client import close_claude_client
+from app.services.background_narrator import background_narrator
+
 # Include Multiplayer API
 from app.api import multiplayer
 
 # 🔗 Include Linkup.so API for D&D content enhancement
 from app.api.linkup.routes import router as linkup_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers with the server"""
+    get_http_client()
+    tts_batcher.start()
+    yield
+    await tts_batcher.stop()
+    await background_narrator.stop()
+    await close_http_client()
+    await close_claude_client()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="NeuroDungeon - Agentic AI D&D System",
     description="Autonomous AI-powered Dungeons & Dragons with intelligent decision-making",
     version="4.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -120,7 +141,7 @@ async def root():
     anthropic_status = "🟢 Active" if os.getenv("ANTHROPIC_API_KEY") and os.getenv("ANTHROPIC_API_KEY") != "your_anthropic_api_key_here" else "🟡 Fallback Mode"
     
     # Get agentic AI status
-    ai_report = agentic_dm.get_ai_status_report()
+    ai_report = get_agentic_dm().get_ai_status_report()
     
     return {
         "message": "🤖 Welcome to NeuroDungeon - Agentic AI D&D System!",
@@ -161,7 +182,7 @@ async def health_check():
         
         # Get agentic AI detailed status with error handling
         try:
-            ai_report = agentic_dm.get_ai_status_report()
+            ai_report = get_agentic_dm().get_ai_status_report()
         except Exception as e:
             print(f"Warning: Could not get AI status: {e}")
             ai_report = {
@@ -217,6 +238,18 @@ async def health_check():
 # REAL AI DUNGEON MASTER ENDPOINTS
 # ==============================================================================
 
+def _dm_response(reply: DungeonMasterResponse) -> ORJSONResponse:
+    """Encode a DM reply with orjson, skipping FastAPI's second pass over response_model"""
+    return ORJSONResponse(reply.model_dump())
+
+def _agentic_error_text(error_message: str) -> str:
+    """Show clear error messages instead of fallback"""
+    if "ANTHROPIC_API_KEY" in error_message:
+        return "🚨 **CLAUDE API KEY MISSING!**\n\nYour AI needs a valid Anthropic API key to work. Please:\n1. Get a key from https://console.anthropic.com/\n2. Add it to your .env file as ANTHROPIC_API_KEY=your_key_here\n3. Restart the server"
+    if "CLAUDE API FAILED" in error_message:
+        return f"🚨 **CLAUDE API ERROR!**\n\n{error_message}\n\nPlease check:\n1. Your ANTHROPIC_API_KEY is valid\n2. You have internet connection\n3. Your API quota isn't exceeded"
+    return f"🚨 **AI SYSTEM ERROR:**\n\n{error_message}\n\nPlease check the server logs for more details."
+
 @app.post("/api/dm/chat", response_model=DungeonMasterResponse)
 async def chat_with_agentic_dm(request: MessageRequest):
     """Chat with the AGENTIC AI Dungeon Master - autonomous, intelligent, learning"""
@@ -226,13 +259,13 @@ async def chat_with_agentic_dm(request: MessageRequest):
         campaign = campaigns_db.get(request.campaign_id) if request.campaign_id else None
         
         # Process with agentic AI (includes analysis, decision-making, planning, execution)
-        agentic_response = await agentic_dm.process_player_input(
+        agentic_response = await get_agentic_dm().process_player_input(
             request.message, 
             character=character,
             campaign=campaign
         )
         
-        return DungeonMasterResponse(
+        return _dm_response(DungeonMasterResponse(
             response=agentic_response["response"],
             timestamp=agentic_response["timestamp"],
             action_type=agentic_response.get("ai_decisions", {}).get("story_direction"),
@@ -242,26 +275,40 @@ async def chat_with_agentic_dm(request: MessageRequest):
             sound_cue="🤖",  # Agentic AI indicator
             world_state=agentic_response.get("world_state"),
             immersion_level=agentic_response.get("immersion_level", "agentic_maximum")
-        )
+        ))
         
     except Exception as e:
         error_message = str(e)
         print(f"❌ Agentic AI Error: {error_message}")
         
-        # Show clear error messages instead of fallback
-        if "ANTHROPIC_API_KEY" in error_message:
-            error_response = "🚨 **CLAUDE API KEY MISSING!**\n\nYour AI needs a valid Anthropic API key to work. Please:\n1. Get a key from https://console.anthropic.com/\n2. Add it to your .env file as ANTHROPIC_API_KEY=your_key_here\n3. Restart the server"
-        elif "CLAUDE API FAILED" in error_message:
-            error_response = f"🚨 **CLAUDE API ERROR!**\n\n{error_message}\n\nPlease check:\n1. Your ANTHROPIC_API_KEY is valid\n2. You have internet connection\n3. Your API quota isn't exceeded"
-        else:
-            error_response = f"🚨 **AI SYSTEM ERROR:**\n\n{error_message}\n\nPlease check the server logs for more details."
-        
-        return DungeonMasterResponse(
-            response=error_response,
+        return _dm_response(DungeonMasterResponse(
+            response=_agentic_error_text(error_message),
             timestamp=datetime.now().isoformat(),
             action_type="claude_api_error",
             immersion_level="error_diagnostic"
-        )
+        ))
+
+@app.post("/api/dm/chat/stream")
+async def stream_chat_with_agentic_dm(request: MessageRequest):
+    """Chat with the agentic DM, streaming the narration as plain text while Claude writes it"""
+    character = characters_db.get(request.character_id) if request.character_id else None
+    campaign = campaigns_db.get(request.campaign_id) if request.campaign_id else None
+    
+    async def narration():
+        try:
+            async for text in get_agentic_dm().stream_player_input(
+                request.message,
+                character=character,
+                campaign=campaign
+            ):
+                yield text
+        except Exception as e:
+            # Headers are already sent, so the error goes out as the rest of the text
+            error_message = str(e)
+            print(f"❌ Agentic AI Error: {error_message}")
+            yield _agentic_error_text(error_message)
+    
+    return StreamingResponse(narration(), media_type="text/plain; charset=utf-8")
 
 @app.get("/api/dm/introduction")
 async def get_agentic_dm_introduction(campaign_name: str = "NeuroDungeon"):
@@ -308,6 +355,7 @@ async def change_agentic_personality(personality_type: str):
             raise ValueError(f"Invalid personality. Choose from: {valid_personalities}")
         
         # Update agentic AI personality
+        agentic_dm = get_agentic_dm()
         agentic_dm.personality_type = personality_type
         
         # Adjust AI goals based on personality
@@ -337,7 +385,7 @@ async def change_agentic_personality(personality_type: str):
 @app.get("/api/dm/world-state")
 async def get_agentic_world_state():
     """Get the current world state and AI analysis"""
-    ai_report = agentic_dm.get_ai_status_report()
+    ai_report = get_agentic_dm().get_ai_status_report()
     
     return {
         "world_state": ai_report["world_state"],
@@ -353,7 +401,7 @@ async def get_agentic_world_state():
 @app.get("/api/ai/reasoning")
 async def get_ai_reasoning():
     """Get transparent view of AI decision-making process"""
-    ai_report = agentic_dm.get_ai_status_report()
+    ai_report = get_agentic_dm().get_ai_status_report()
     
     return {
         "ai_type": "Agentic Autonomous AI",
@@ -374,7 +422,7 @@ async def get_ai_reasoning():
 @app.get("/api/ai/status-report")
 async def get_full_ai_status():
     """Get comprehensive agentic AI system status"""
-    return agentic_dm.get_ai_status_report()
+    return get_agentic_dm().get_ai_status_report()
 
 # ==============================================================================
 # ENHANCED DICE ROLLING ENDPOINTS
@@ -527,7 +575,7 @@ async def update_character(character_id: str, updates: CharacterUpdate):
     if updates.gold is not None:
         character.gold = max(0, updates.gold)
     
-    character.updated_at = datetime.now()
+    character.touch()
     characters_db[character_id] = character
     
     return character
@@ -550,6 +598,10 @@ async def delete_character(character_id: str):
 # CAMPAIGN MANAGEMENT ENDPOINTS (same as before)
 # ==============================================================================
 
+def _campaign_response(campaign: Campaign) -> ORJSONResponse:
+    """Dump a campaign and let orjson encode it (datetimes included) without re-validating"""
+    return ORJSONResponse(campaign.model_dump())
+
 @app.post("/api/campaigns/create", response_model=Campaign)
 async def create_campaign(campaign_data: CampaignCreate):
     """Create a new D&D campaign"""
@@ -565,7 +617,7 @@ async def create_campaign(campaign_data: CampaignCreate):
         campaign = _add_starter_campaign_content(campaign)
         
         campaigns_db[campaign.id] = campaign
-        return campaign
+        return _campaign_response(campaign)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Campaign creation failed: {str(e)}")
@@ -575,12 +627,12 @@ async def get_campaign(campaign_id: str):
     """Get campaign details"""
     if campaign_id not in campaigns_db:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    return campaigns_db[campaign_id]
+    return _campaign_response(campaigns_db[campaign_id])
 
 @app.get("/api/campaigns")
 async def list_campaigns():
     """List all campaigns"""
-    return list(campaigns_db.values())
+    return ORJSONResponse([campaign.model_dump() for campaign in campaigns_db.values()])
 
 @app.post("/api/campaigns/{campaign_id}/join")
 async def join_campaign(campaign_id: str, character_id: str, player_id: str):
@@ -610,7 +662,7 @@ async def generate_voice_acted_dm_response(request: MessageRequest):
     """Generate voice-acted DM response with character voices"""
     try:
         # Get the AI response first
-        ai_response = await agentic_dm.process_player_input(
+        ai_response = await get_agentic_dm().process_player_input(
             request.message,
             character=characters_db.get(request.character_id) if request.character_id else None
         )
@@ -905,7 +957,7 @@ def _add_starter_campaign_content(campaign: Campaign) -> Campaign:
         rewards=["50 gold pieces", "Gratitude of the merchant's family"],
         level_requirement=1
     )
-    campaign.quests.append(quest)
+    campaign.add_quest(quest)
     
     return campaign
 
@@ -1243,10 +1295,13 @@ if __name__ == "__main__":
     print("🤖 AI Reasoning: http://127.0.0.1:8000/api/ai/reasoning")
     print("📊 AI Status: http://127.0.0.1:8000/api/ai/status-report")
     
+    # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
         port=8000,
         reload=True,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level="info"
     ) 
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Quest index test: direct edits to quests are reflected by the campaign getters
+"""
+
+import copy
+
+from app.models.campaign import Campaign, Quest, QuestStatus
+
+def _campaign() -> Campaign:
+    campaign = Campaign(name="Test", description="Test campaign", dm_id="dm")
+    for name, level in (("High", 3), ("Low", 1), ("Mid", 2)):
+        campaign.add_quest(Quest(name=name, description=name, level_requirement=level))
+    campaign.current_level = 3
+    return campaign
+
+def test_available_quests_keep_list_order():
+    """Available quests come back in campaign order, not sorted by level"""
+    campaign = _campaign()
+    assert [quest.name for quest in campaign.get_available_quests()] == ["High", "Low", "Mid"]
+    
+    campaign.current_level = 2
+    assert [quest.name for quest in campaign.get_available_quests()] == ["Low", "Mid"]
+
+def test_direct_status_change():
+    """Setting quest.status directly updates both getters"""
+    campaign = _campaign()
+    low = campaign.quests[1]
+    
+    low.status = QuestStatus.ACTIVE
+    assert campaign.get_active_quests() == [low]
+    assert low not in campaign.get_available_quests()
+    
+    low.status = QuestStatus.COMPLETED
+    assert campaign.get_active_quests() == []
+    assert low not in campaign.get_available_quests()
+    
+    campaign.quests[0].level_requirement = 5
+    assert [quest.name for quest in campaign.get_available_quests()] == ["Mid"]
+
+def test_deep_copy_is_independent():
+    """A deep copy's index follows the copy's quests, not the original's"""
+    campaign = _campaign()
+    clone = copy.deepcopy(campaign)
+    
+    clone.quests[0].status = QuestStatus.ACTIVE
+    assert [quest.name for quest in clone.get_active_quests()] == ["High"]
+    assert campaign.get_active_quests() == []
+    
+    campaign.set_quest_status(campaign.quests[2].id, QuestStatus.ACTIVE)
+    assert [quest.name for quest in campaign.get_active_quests()] == ["Mid"]
+    assert [quest.name for quest in clone.get_active_quests()] == ["High"]
+
+if __name__ == "__main__":
+    test_available_quests_keep_list_order()
+    test_direct_status_change()
+    test_deep_copy_is_independent()
+    print("✅ Quest index OK")
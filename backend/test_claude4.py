@@ -105,7 +105,8 @@ def test_no_fallbacks():
     
     # Import and test the agentic AI
     try:
-        from app.services.agentic_ai import agentic_dm
+        from app.services.agentic_ai import get_agentic_dm
+        agentic_dm = get_agentic_dm()
         
         # Check if Claude is initialized
         if agentic_dm.anthropic is None:
@@ -58,7 +58,8 @@ def test_claude_no_fallbacks():
     # 3. Test Agentic AI System
     try:
         print("\n🤖 Testing Agentic AI System...")
-        from app.services.agentic_ai import agentic_dm
+        from app.services.agentic_ai import get_agentic_dm
+        agentic_dm = get_agentic_dm()
         
         if agentic_dm.anthropic is None:
             print("❌ CRITICAL: Agentic AI is in fallback mode!")
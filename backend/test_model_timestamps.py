@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Round-trip test: a dumped TimestampedModel keeps its updated_at
+"""
+
+from datetime import datetime
+
+from app.models.base import TimestampedModel
+
+class Stamped(TimestampedModel):
+    name: str = "stamped"
+
+def test_updated_at_round_trip():
+    """model_validate(model_dump()) keeps the stored timestamp"""
+    original = Stamped()
+    original.updated_at = datetime(2024, 5, 17, 12, 30, 45, 123456)
+    
+    restored = Stamped.model_validate(original.model_dump())
+    assert restored.updated_at == original.updated_at
+    
+    from_json = Stamped.model_validate_json(original.model_dump_json())
+    assert from_json.updated_at == original.updated_at
+
+def test_updated_at_from_iso_string():
+    """A client-supplied ISO timestamp is honoured"""
+    restored = Stamped.model_validate({"updated_at": "2023-01-02T03:04:05.000006"})
+    assert restored.updated_at == datetime(2023, 1, 2, 3, 4, 5, 6)
+
+if __name__ == "__main__":
+    test_updated_at_round_trip()
+    test_updated_at_from_iso_string()
+    print("✅ Timestamp round-trip OK")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+OpenAPI test: json_body() routes still document their request bodies
+"""
+
+import pytest
+from fastapi import FastAPI
+
+def _request_bodies(router, prefix: str) -> dict:
+    app = FastAPI()
+    app.include_router(router, prefix=prefix)
+    return {
+        path: operation["requestBody"]["content"]["application/json"]["schema"]
+        for path, operations in app.openapi()["paths"].items()
+        for method, operation in operations.items()
+        if method == "post" and "requestBody" in operation
+    }
+
+def test_multiplayer_request_bodies():
+    """Multiplayer POST routes list their body schemas"""
+    from app.api import multiplayer
+    
+    bodies = _request_bodies(multiplayer.router, "/api/multiplayer")
+    assert set(bodies) == {
+        "/api/multiplayer/create-session",
+        "/api/multiplayer/player-action",
+        "/api/multiplayer/generate-voice"
+    }
+    
+    action = bodies["/api/multiplayer/player-action"]
+    assert action["type"] == "object"
+    assert {"session_id", "player_name", "action"} <= set(action["required"])
+    assert "voice_async" in action["properties"]
+
+def test_linkup_request_bodies():
+    """Linkup POST routes list their body schemas"""
+    pytest.importorskip("linkup")
+    from app.api.linkup.routes import router
+    
+    bodies = _request_bodies(router, "/api/linkup")
+    assert len(bodies) == 7
+    assert bodies["/api/linkup/rules-lookup"]["required"] == ["query"]
+
+if __name__ == "__main__":
+    test_multiplayer_request_bodies()
+    test_linkup_request_bodies()
+    print("✅ OpenAPI request bodies OK")